@@ -25,7 +25,7 @@ from analyzers.semantic_analyzer import EnhancedSemanticModelAnalyzer
 from analyzers.mcode_analyzer import EnhancedMCodeAnalyzer
 from analyzers.unified_analyzer import UnifiedPowerBIAnalyzer
 from tools.tmdl_client import TmdlClient
-from tools.pbix_extractor import extract_bindings_from_layout, read_layout_from_pbix
+from tools.pbix_extractor import read_bindings_from_pbix
 from config.settings import TMDL_TOOLS_PATH
 
 logging.basicConfig(level=logging.INFO)
@@ -376,8 +376,7 @@ class ModelHealthOrchestrator:
                         )
 
                     # Extract bindings
-                    layout = read_layout_from_pbix(str(pbix_path))
-                    bindings = extract_bindings_from_layout(layout)
+                    bindings = read_bindings_from_pbix(str(pbix_path))
 
                     all_bindings.extend(bindings)
 
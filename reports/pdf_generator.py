@@ -34,7 +34,7 @@ from analyzers.mcode_analyzer import EnhancedMCodeAnalyzer
 from config.settings import REPORTS_DIR, CACHE_DIR
 from core.orchestrator import ModelHealthOrchestrator
 from core.powerbi_client import PowerBIClient
-from tools.pbix_extractor import read_layout_from_pbix, extract_bindings_from_layout
+from tools.pbix_extractor import read_bindings_from_pbix
 from core.orchestrator import ModelHealthOrchestrator
 
 # Optional legacy utilities (guarded). These are not required for API PDF generation.
@@ -307,8 +307,7 @@ class PDFReportGenerator:
 
                 # Extract bindings to JSON for downstream analysis
                 try:
-                    layout = read_layout_from_pbix(str(pbix_path))
-                    structure = extract_bindings_from_layout(layout)
+                    structure = read_bindings_from_pbix(str(pbix_path))
                     with open(structure_path, "w", encoding="utf-8") as f:
                         json.dump(structure, f, indent=2)
                     status.update({"saved": True, "pbix": str(pbix_path), "structure": str(structure_path)})
@@ -10,7 +10,7 @@ Tools for extracting and querying Power BI semantic model data:
 
 from .tmdl_client import TmdlClient
 from .dax_query_client import DaxQueryClient, analyze_model, INFO_VIEW_QUERIES
-from .pbix_extractor import extract_bindings_from_layout, read_layout_from_pbix
+from .pbix_extractor import PbixReader, extract_bindings_from_layout, read_bindings_from_pbix, read_layout_from_pbix
 from .dataflow_client import DataflowClient
 
 __all__ = [
@@ -18,7 +18,9 @@ __all__ = [
     'DaxQueryClient',
     'analyze_model',
     'INFO_VIEW_QUERIES',
+    'PbixReader',
     'extract_bindings_from_layout',
+    'read_bindings_from_pbix',
     'read_layout_from_pbix',
     'DataflowClient',
 ]
@@ -8,25 +8,320 @@ Supports downloading individual dataflows or all dataflows from a workspace.
 """
 
 import os
+import re
+import asyncio
 import sys
+import shutil
 import json
+import time
+import logging
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import base64
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 from typing import Dict, List, Optional
 import keyring
 import subprocess
 
+try:
+    import orjson
+except ImportError:  # optional speed-up; the stdlib json module is used without it
+    orjson = None
+
+
+logger = logging.getLogger(__name__)
+
+# Matches the "\r\nshared <Name> =" header that starts each query in an M section document
+_SHARED_NAME = re.compile(r'\r\nshared\s+(\w+)\s*=')
+# Trailing semicolon (and whitespace) at the end of a shared query body
+_TRAIL_SEMI = re.compile(r';\s*$')
+
+# Escape sequences left in the document after JSON decoding, replaced in a single pass
+_ESCAPES = {'\\r\\n': '\r\n', '\\n': '\n', '\\t': '\t', '\\"': '"'}
+_ESCAPE_RE = re.compile(r'\\r\\n|\\n|\\t|\\"')
+
+# Anything other than alphanumerics, space, '-' and '_' is dropped from output file names.
+# \w uses the same Unicode alphanumeric test as str.isalnum(), so non-ASCII names survive.
+_UNSAFE_FILENAME_RE = re.compile(r'[^\w \-]')
+
+# Whether the Azure CLI is on PATH; probed once per process
+_az_available: Optional[bool] = None
+
+
+def _az_cli_available() -> bool:
+    """Return True if the ``az`` executable can be found (az.cmd on Windows via PATHEXT)."""
+    global _az_available
+    if _az_available is None:
+        _az_available = shutil.which("az") is not None
+    return _az_available
+
+
+def _az_account_id() -> Optional[str]:
+    """
+    Identify the active az login (tenant, user and subscription) from the CLI's profile file.
+    
+    Read directly rather than via ``az account show``, so validating a cached token
+    costs no process spawn. Returns None when there is no readable profile.
+    """
+    config_dir = os.getenv("AZURE_CONFIG_DIR") or os.path.join(os.path.expanduser("~"), ".azure")
+    try:
+        with open(os.path.join(config_dir, "azureProfile.json"), encoding="utf-8-sig") as f:
+            profile = json.load(f)
+        for subscription in profile.get("subscriptions", []):
+            if subscription.get("isDefault"):
+                user = subscription.get("user") or {}
+                return "|".join((subscription.get("tenantId", ""), user.get("name", ""), subscription.get("id", "")))
+    except (OSError, ValueError, AttributeError):
+        pass
+    return None
+
+
+def _json_loads(data: bytes):
+    """Parse a JSON payload, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _retry_after_seconds(value: Optional[str], default: float = 1.0) -> float:
+    """Parse a Retry-After header, given either as delay-seconds or as an HTTP date."""
+    if not value:
+        return default
+    try:
+        return max(0, int(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def _run_coroutine(coro):
+    """Run a coroutine to completion from sync code, on a worker thread if this thread's event loop is running."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # asyncio.run() refuses to nest (notebooks, async web handlers), so give it a thread of its own
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+# Separator lines used in the .txt report, built once
+_EQ80 = "=" * 80
+_EQ50_LINE = "=" * 50 + "\n"
+_DASH40_LINE = "─" * 40 + "\n\n"
+
+# Header block and declaration line that introduce each shared query
+_BANNER_FMT = _EQ80 + "\n# SHARED: {0}\n" + _EQ80 + "\n\nshared {0} ="
+
+
+# Pre-built indentation prefixes for the let...in formatter (levels move in steps of 4)
+_INDENTS = [' ' * i for i in range(0, 64, 4)]
+
+
+def _indent(level: int) -> str:
+    """Return the indentation prefix for ``level`` spaces."""
+    if level <= 0:
+        return ''
+    index = level // 4
+    return _INDENTS[index] if index < len(_INDENTS) else ' ' * level
+
+
+# The formatters are module-level functions so they can be shipped to a process pool
+def _format_document_section(document: str) -> str:
+    """Format the document section with proper headers and line breaks using advanced cleaning."""
+    if not document:
+        return "No document content available"
+
+    # The document comes as a JSON string with escaped characters
+    # We need to unescape it first
+    if '\\' not in document:
+        # Nothing is escaped (the usual case once response.json() has decoded
+        # the payload), so both unescape passes below would be no-ops
+        m_code = document
+    else:
+        try:
+            # Unescape the JSON string
+            unescaped_document = json.loads(f'"{document}"')
+        except:
+            # If JSON parsing fails, try direct replacement
+            unescaped_document = document
+
+        # Replace escaped characters
+        m_code = _ESCAPE_RE.sub(lambda m: _ESCAPES[m.group(0)], unescaped_document)
+
+    cleaned_content = []
+    last_end = 0
+    in_shared = False
+
+    # Stream over the shared headers; the text between two headers is the body
+    # of the earlier one, so it is emitted when the next header is reached
+    for match in _SHARED_NAME.finditer(m_code):
+        section_content = m_code[last_end:match.start()]
+        if in_shared:
+            # Remove trailing semicolon since it's followed by another shared
+            cleaned_content.append(_TRAIL_SEMI.sub('', section_content))
+            cleaned_content.append(";\n\n")
+        elif section_content.strip():
+            # The first section (before any shared)
+            cleaned_content.append(section_content.strip())
+            cleaned_content.append("\n\n")
+
+        # Add header and the shared declaration
+        cleaned_content.append(_BANNER_FMT.format(match.group(1)))
+        last_end = match.end()
+        in_shared = True
+
+    section_content = m_code[last_end:]
+    if in_shared:
+        cleaned_content.append(section_content)
+        cleaned_content.append(";\n\n")
+    elif section_content.strip():
+        cleaned_content.append(section_content.strip())
+        cleaned_content.append("\n\n")
+
+    # Join all cleaned content
+    final_content = ''.join(cleaned_content)
+
+    # Additional formatting improvements
+    # Fix indentation for let...in blocks
+    final_content = _format_let_in_blocks(final_content)
+
+    return final_content
+
+
+def _format_let_in_blocks(content: str) -> str:
+    """Improve formatting of let...in blocks"""
+    lines = content.split('\n')
+    formatted_lines = []
+    indent_level = 0
+    prefix = ''
+    in_let_block = False
+
+    for line in lines:
+        stripped = line.strip()
+
+        # Adjust indent level; the prefix is only rebuilt when the level changes
+        if stripped.startswith('let'):
+            in_let_block = True
+            formatted_lines.append(prefix + stripped)
+            indent_level += 4
+            prefix = _indent(indent_level)
+        elif stripped == 'in':
+            formatted_lines.append(_indent(indent_level - 4) + stripped)
+        elif stripped.startswith('in '):
+            indent_level -= 4
+            prefix = _indent(indent_level)
+            formatted_lines.append(prefix + stripped)
+            in_let_block = False
+        elif in_let_block and stripped.endswith(','):
+            formatted_lines.append(prefix + stripped)
+        elif in_let_block and not stripped:
+            formatted_lines.append('')
+        else:
+            # Check if we're ending a let block
+            if in_let_block and (stripped.endswith(';') or 'in\n' in line):
+                indent_level = max(0, indent_level - 4)
+                prefix = _indent(indent_level)
+                in_let_block = False
+            formatted_lines.append(prefix + stripped)
+
+    return '\n'.join(formatted_lines)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket used to pace Power BI API calls.
+    
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    A caller that finds the bucket empty reserves its token anyway and
+    sleeps until that token would have been refilled, so concurrent callers
+    are scheduled in order instead of all retrying at once.
+    """
+    
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+    
+    def acquire(self, tokens: float = 1) -> None:
+        """Take ``tokens`` from the bucket, sleeping until they are available."""
+        with self._lock:
+            self._refill()
+            self.tokens -= tokens
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        
+        if wait > 0:
+            time.sleep(wait)
+    
+    def penalize(self) -> None:
+        """Drain the bucket after the server reported throttling (HTTP 429)."""
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.tokens, -1)
+
 
 class DataflowDownloader:
     """
     Downloads dataflow definitions from Microsoft Power BI.
     """
     
+    # Power BI allows roughly 120 requests per minute per user on these endpoints
+    REQUESTS_PER_MINUTE = 120
+    MAX_RETRIES = 5
+    # download_all_dataflows pipeline sizing: concurrent fetches, concurrent writes,
+    # and how many items may wait between stages before upstream work pauses
+    FETCH_WORKERS = 4
+    WRITE_WORKERS = 2
+    PIPELINE_QUEUE_SIZE = 4
+    # Cached Azure CLI tokens are refreshed this long before they expire
+    TOKEN_EXPIRY_MARGIN = timedelta(minutes=5)
+    
     def __init__(self):
         self.base_url = "https://api.powerbi.com/v1.0/myorg"
         self.token = self._get_token()
         self.outputs_dir = "Outputs"
+        self.rate_limiter = TokenBucket(
+            capacity=self.REQUESTS_PER_MINUTE,
+            rate=self.REQUESTS_PER_MINUTE / 60.0
+        )
+        self._workspace_name_cache: Dict[str, str] = {}
+        self._name_index_cache: Dict[str, Dict[str, str]] = {}
+        
+        # One keep-alive session for all calls so the TLS handshake is paid once.
+        # 429s are left to make_request so they go through the rate limiter.
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Authorization': f'Bearer {self.token}',
+            'Content-Type': 'application/json'
+        })
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=10,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[502, 503, 504],
+                raise_on_status=False
+            )
+        )
+        self.session.mount('https://', adapter)
         
         # Create outputs directory if it doesn't exist
         if not os.path.exists(self.outputs_dir):
@@ -47,8 +342,17 @@ class DataflowDownloader:
         except:
             pass
         
+        # Try a previously cached Azure CLI token
+        token = self._load_cached_cli_token()
+        if token:
+            return token
+        
         # Try Azure CLI
         try:
+            # Fail fast instead of paying for a process spawn when az isn't installed
+            if not _az_cli_available():
+                raise FileNotFoundError("az")
+            
             import platform
             
             # Use shell=True on Windows to ensure az.cmd is found
@@ -62,37 +366,88 @@ class DataflowDownloader:
                 shell=use_shell
             )
             token_data = json.loads(result.stdout)
-            return token_data.get("accessToken", "")
+            token = token_data.get("accessToken", "")
+            if token and token_data.get("expiresOn"):
+                self._store_cached_cli_token(token, token_data["expiresOn"])
+            return token
         except (subprocess.CalledProcessError, FileNotFoundError):
             print("❌ Error: No authentication token found.")
             print("💡 Please set POWERBI_TOKEN environment variable or run 'az login'")
             print("💡 You can also use: az account get-access-token --resource https://analysis.windows.net/powerbi/api")
             sys.exit(1)
     
+    def _load_cached_cli_token(self) -> Optional[str]:
+        """
+        Return the cached Azure CLI token if it is not about to expire.
+        
+        The token is only reused while az is still logged in to the account it was
+        issued for; after ``az account set`` or a login as someone else it is skipped.
+        """
+        try:
+            cached = keyring.get_password("powerbi", "token_cache")
+            if not cached:
+                return None
+            data = json.loads(cached)
+            account = _az_account_id()
+            if account is None or data.get("account") != account:
+                return None
+            # az reports expiresOn as naive local time, e.g. "2024-01-31 17:05:12.000000"
+            expires = datetime.fromisoformat(data["expires"])
+            if expires - datetime.now() > self.TOKEN_EXPIRY_MARGIN:
+                return data["token"]
+        except Exception:
+            pass
+        return None
+    
+    def _store_cached_cli_token(self, token: str, expires_on: str) -> None:
+        """Cache an Azure CLI token in the keyring so later runs can skip the az call."""
+        try:
+            keyring.set_password("powerbi", "token_cache", json.dumps({
+                "token": token,
+                "expires": expires_on,
+                "account": _az_account_id()
+            }))
+        except Exception:
+            pass
+    
     def make_request(self, method: str, url: str, **kwargs) -> Dict:
         """Make authenticated HTTP request to Power BI API."""
-        headers = {
-            'Authorization': f'Bearer {self.token}',
-            'Content-Type': 'application/json'
-        }
-        
-        if 'headers' in kwargs:
-            headers.update(kwargs['headers'])
-            del kwargs['headers']
-        
         try:
-            response = requests.request(method, url, headers=headers, **kwargs)
+            for attempt in range(self.MAX_RETRIES):
+                self.rate_limiter.acquire(1)
+                response = self.session.request(method, url, **kwargs)
+                
+                logger.debug("API request: %s %s", method, url)
+                logger.debug("Status code: %d", response.status_code)
+                
+                if response.status_code != 429:
+                    break
+                
+                # Throttled: drain the bucket and honor the server's Retry-After
+                response.close()
+                self.rate_limiter.penalize()
+                if attempt + 1 < self.MAX_RETRIES:
+                    time.sleep(_retry_after_seconds(response.headers.get("Retry-After")))
             
-            print(f"🔍 API Request: {method} {url}")
-            print(f"📊 Status Code: {response.status_code}")
+            if response.status_code == 429:
+                # Still throttled after the last attempt; its body was discarded on close
+                return {"error": f"HTTP 429: still throttled after {self.MAX_RETRIES} attempts"}
             
-            if response.status_code == 200:
-                return response.json()
-            elif response.status_code == 404:
-                return {"error": f"Not found: {url}"}
-            else:
-                print(f"❌ Response Text: {response.text}")
-                return {"error": f"HTTP {response.status_code}: {response.text}"}
+            # Closing matters for stream=True, which otherwise holds the pooled connection
+            # until the body is read, including on the error branches
+            with response:
+                if response.status_code == 200:
+                    # Parse the raw bytes directly (skips requests' charset detection). A streamed
+                    # body is read off the socket into one buffer, without the chunk list and
+                    # join that building response.content needs.
+                    if kwargs.get('stream'):
+                        return _json_loads(response.raw.read(decode_content=True))
+                    return _json_loads(response.content)
+                elif response.status_code == 404:
+                    return {"error": f"Not found: {url}"}
+                else:
+                    logger.error("Response text: %s", response.text)
+                    return {"error": f"HTTP {response.status_code}: {response.text}"}
         except Exception as e:
             return {"error": f"Request failed: {str(e)}"}
     
@@ -104,24 +459,42 @@ class DataflowDownloader:
     def get_dataflow_details(self, workspace_id: str, dataflow_id: str) -> Dict:
         """Get details of a specific dataflow using Power BI API."""
         url = f"{self.base_url}/groups/{workspace_id}/dataflows/{dataflow_id}"
-        return self.make_request('GET', url)
+        # Dataflow definitions can be several MB, so avoid double-buffering the body
+        return self.make_request('GET', url, stream=True)
     
-    def find_dataflow_by_name(self, workspace_id: str, dataflow_name: str) -> Optional[str]:
-        """Find a dataflow by its display name and return its ID."""
-        dataflows = self.get_workspace_dataflows(workspace_id)
+    def find_dataflow_by_name(self, workspace_id: str, dataflow_name: str, refresh: bool = False) -> Optional[str]:
+        """
+        Find a dataflow by its display name and return its ID.
         
-        if 'error' in dataflows:
-            print(f"❌ Error getting dataflows: {dataflows['error']}")
-            return None
+        The workspace's name -> ID index is built once and reused for later lookups;
+        pass ``refresh=True`` to re-list the workspace's dataflows.
+        """
+        name_index = None if refresh else self._name_index_cache.get(workspace_id)
         
-        for dataflow in dataflows.get('value', []):
-            if dataflow.get('name') == dataflow_name:
-                return dataflow.get('objectId')
+        if name_index is None:
+            dataflows = self.get_workspace_dataflows(workspace_id)
+            
+            if 'error' in dataflows:
+                print(f"❌ Error getting dataflows: {dataflows['error']}")
+                return None
+            
+            # First dataflow wins if several share a display name
+            name_index = {}
+            for dataflow in dataflows.get('value', []):
+                name_index.setdefault(dataflow.get('name'), dataflow.get('objectId'))
+            self._name_index_cache[workspace_id] = name_index
         
-        return None
+        return name_index.get(dataflow_name)
     
-    def download_single_dataflow(self, workspace_id: str, dataflow_name: str = None, dataflow_id: str = None) -> Dict:
-        """Download a single dataflow definition."""
+    def download_single_dataflow(self, workspace_id: str, dataflow_name: str = None, dataflow_id: str = None,
+                                 workspace_name: Optional[str] = None, include_txt: bool = False) -> Dict:
+        """
+        Download a single dataflow definition.
+        
+        The M document is always saved as compact JSON. The human-readable .txt report
+        (headers, full API response, formatted M code) is only written when
+        ``include_txt`` is set, or when the dataflow has no document section to save.
+        """
         if not dataflow_id and not dataflow_name:
             return {"error": "Must provide either dataflow_name or dataflow_id"}
         
@@ -136,88 +509,142 @@ class DataflowDownloader:
             return details
         
         # Get workspace name for filename
-        workspace_name = self._get_workspace_name(workspace_id)
+        if workspace_name is None:
+            workspace_name = self._get_workspace_name(workspace_id)
         
+        return self._save_dataflow(workspace_id, workspace_name, dataflow_id, details, include_txt)
+    
+    def _save_dataflow(self, workspace_id: str, workspace_name: str, dataflow_id: str, details: Dict,
+                       include_txt: bool = False, formatted_document: Optional[str] = None) -> Dict:
+        """Write the output files for fetched dataflow details (see download_single_dataflow)."""
         # Create filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_workspace_name = "".join(c for c in workspace_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
-        safe_dataflow_name = "".join(c for c in details.get('name', 'Unknown') if c.isalnum() or c in (' ', '-', '_')).rstrip()
+        safe_workspace_name = _UNSAFE_FILENAME_RE.sub('', workspace_name).rstrip()
+        safe_dataflow_name = _UNSAFE_FILENAME_RE.sub('', details.get('name', 'Unknown')).rstrip()
+        
+        has_document = 'pbi:mashup' in details and 'document' in details['pbi:mashup']
+        write_txt = include_txt or not has_document
         
         filename = f"{safe_workspace_name}_{safe_dataflow_name}_{timestamp}_DATAFLOW.txt"
         filepath = os.path.join(self.outputs_dir, filename)
+        doc_filename = None
         
-        # Write dataflow definition to file
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(f"Workspace Name: {workspace_name}\n")
-                f.write(f"Workspace ID: {workspace_id}\n")
-                f.write(f"Dataflow Name: {details.get('name', 'Unknown')}\n")
-                f.write(f"Dataflow ID: {dataflow_id}\n")
-                f.write(f"Description: {details.get('description', 'No description')}\n")
-                f.write(f"Version: {details.get('version', 'Unknown')}\n")
-                f.write(f"Culture: {details.get('culture', 'Unknown')}\n")
-                f.write(f"Modified Time: {details.get('modifiedTime', 'Unknown')}\n")
-                f.write("─" * 40 + "\n\n")
-                
-                # Write the full response for debugging
-                f.write("FULL API RESPONSE:\n")
-                f.write("=" * 50 + "\n")
-                f.write(json.dumps(details, indent=2))
-                
-                # Extract queries metadata if available
-                if 'pbi:mashup' in details and 'queriesMetadata' in details['pbi:mashup']:
-                    f.write("\n\nQUERIES METADATA:\n")
-                    f.write("=" * 50 + "\n")
-                    queries = details['pbi:mashup']['queriesMetadata']
-                    for query_name, query_info in queries.items():
-                        f.write(f"\nQuery: {query_name}\n")
-                        f.write(f"  Query ID: {query_info.get('queryId', 'Unknown')}\n")
-                        f.write(f"  Query Name: {query_info.get('queryName', 'Unknown')}\n")
-                        f.write(f"  Load Enabled: {query_info.get('loadEnabled', 'Unknown')}\n")
-                
-                # Extract document section if available
-                if 'pbi:mashup' in details and 'document' in details['pbi:mashup']:
-                    f.write("\n\nDOCUMENT SECTION:\n")
-                    f.write("=" * 50 + "\n")
-                    document = details['pbi:mashup']['document']
-                    
-                    # Parse and format the document section
-                    formatted_document = self._format_document_section(document)
-                    f.write(formatted_document)
+            # Write dataflow definition to file
+            if write_txt:
+                self._write_dataflow_txt(filepath, workspace_name, workspace_id, dataflow_id, details,
+                                         formatted_document)
             
             # Also save the document section as a separate file if available
-            if 'pbi:mashup' in details and 'document' in details['pbi:mashup']:
+            if has_document:
                 document = details['pbi:mashup']['document']
                 doc_filename = f"{safe_workspace_name}_{safe_dataflow_name}_{timestamp}_DOCUMENT.json"
                 doc_filepath = os.path.join(self.outputs_dir, doc_filename)
                 
-                with open(doc_filepath, 'w', encoding='utf-8') as f:
-                    f.write(json.dumps(document, indent=2))
+                # Not meant for humans (the .txt has the formatted view), so skip pretty-printing
+                if orjson is not None:
+                    with open(doc_filepath, 'wb') as f:
+                        f.write(orjson.dumps(document))
+                else:
+                    with open(doc_filepath, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                        json.dump(document, f, separators=(',', ':'))
                 
                 print(f"📄 Document saved to: {doc_filename}")
             
             return {
                 'success': True,
-                'filename': filename,
+                'filename': filename if write_txt else doc_filename,
                 'dataflow_name': details.get('name'),
                 'dataflow_id': dataflow_id,
                 'workspace_name': workspace_name,
-                'filepath': filepath,
-                'document_file': doc_filename if 'pbi:mashup' in details and 'document' in details['pbi:mashup'] else None
+                'filepath': filepath if write_txt else doc_filepath,
+                'document_file': doc_filename
             }
             
         except Exception as e:
             return {"error": f"Failed to write file: {str(e)}"}
     
-    def download_all_dataflows(self, workspace_id: str) -> Dict:
-        """Download all dataflows from a workspace."""
+    def _write_dataflow_txt(self, filepath: str, workspace_name: str, workspace_id: str,
+                            dataflow_id: str, details: Dict, formatted_document: Optional[str] = None) -> None:
+        """Write the human-readable .txt report, formatting the document unless already done."""
+        # Assemble the text around the API response in memory; the response
+        # itself is streamed into the buffered file with json.dump
+        header = [
+            f"Workspace Name: {workspace_name}\n",
+            f"Workspace ID: {workspace_id}\n",
+            f"Dataflow Name: {details.get('name', 'Unknown')}\n",
+            f"Dataflow ID: {dataflow_id}\n",
+            f"Description: {details.get('description', 'No description')}\n",
+            f"Version: {details.get('version', 'Unknown')}\n",
+            f"Culture: {details.get('culture', 'Unknown')}\n",
+            f"Modified Time: {details.get('modifiedTime', 'Unknown')}\n",
+            _DASH40_LINE,
+            # Write the full response for debugging
+            "FULL API RESPONSE:\n",
+            _EQ50_LINE,
+        ]
+        parts = []
+        
+        # Extract queries metadata if available
+        if 'pbi:mashup' in details and 'queriesMetadata' in details['pbi:mashup']:
+            parts.append("\n\nQUERIES METADATA:\n")
+            parts.append(_EQ50_LINE)
+            queries = details['pbi:mashup']['queriesMetadata']
+            for query_name, query_info in queries.items():
+                parts.append(
+                    f"\nQuery: {query_name}\n"
+                    f"  Query ID: {query_info.get('queryId', 'Unknown')}\n"
+                    f"  Query Name: {query_info.get('queryName', 'Unknown')}\n"
+                    f"  Load Enabled: {query_info.get('loadEnabled', 'Unknown')}\n"
+                )
+        
+        # Extract document section if available
+        if 'pbi:mashup' in details and 'document' in details['pbi:mashup']:
+            parts.append("\n\nDOCUMENT SECTION:\n")
+            parts.append(_EQ50_LINE)
+            document = details['pbi:mashup']['document']
+            
+            # Parse and format the document section
+            if formatted_document is None:
+                formatted_document = self._format_document_section(document)
+            parts.append(formatted_document)
+        
+        with open(filepath, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.write("".join(header))
+            if orjson is not None:
+                f.write(orjson.dumps(details, option=orjson.OPT_INDENT_2).decode('utf-8'))
+            else:
+                json.dump(details, f, indent=2)
+            f.write("".join(parts))
+    
+    def download_all_dataflows(self, workspace_id: str, include_txt: bool = False) -> Dict:
+        """
+        Download all dataflows from a workspace.
+        
+        Blocking wrapper around download_all_dataflows_async. Inside a running event
+        loop it runs the download on a worker thread; async callers can await
+        download_all_dataflows_async directly.
+        """
+        return _run_coroutine(self.download_all_dataflows_async(workspace_id, include_txt))
+    
+    async def download_all_dataflows_async(self, workspace_id: str, include_txt: bool = False) -> Dict:
+        """
+        Download all dataflows from a workspace as a three-stage producer/consumer pipeline.
+        
+        Fetchers pull details from the API (in threads, paced by the rate limiter),
+        formatters run the CPU-bound M formatting in worker processes when a .txt
+        report is requested, and writers save the files. Bounded queues between the
+        stages provide backpressure, so network, CPU and disk work overlap.
+        """
+        loop = asyncio.get_running_loop()
+        
         # Get all dataflows
-        dataflows = self.get_workspace_dataflows(workspace_id)
+        dataflows = await loop.run_in_executor(None, self.get_workspace_dataflows, workspace_id)
         
         if 'error' in dataflows:
             return dataflows
         
-        workspace_name = self._get_workspace_name(workspace_id)
+        workspace_name = await loop.run_in_executor(None, self._get_workspace_name, workspace_id)
         results = {
             'success': True,
             'workspace_name': workspace_name,
@@ -229,139 +656,107 @@ class DataflowDownloader:
         
         print(f"📊 Found {len(dataflows.get('value', []))} dataflows in workspace '{workspace_name}'")
         
-        for dataflow in dataflows.get('value', []):
-            dataflow_name = dataflow.get('name', 'Unknown')
-            dataflow_id = dataflow.get('objectId')
-            
-            print(f"📥 Downloading dataflow: {dataflow_name}")
-            
-            result = self.download_single_dataflow(workspace_id, dataflow_id=dataflow_id)
+        todo: asyncio.Queue = asyncio.Queue()
+        fetched: asyncio.Queue = asyncio.Queue(maxsize=self.PIPELINE_QUEUE_SIZE)
+        formatted: asyncio.Queue = asyncio.Queue(maxsize=self.PIPELINE_QUEUE_SIZE)
+        outcomes = []
+        
+        for index, dataflow in enumerate(dataflows.get('value', [])):
+            todo.put_nowait((index, dataflow.get('name', 'Unknown'), dataflow.get('objectId')))
+        
+        async def fetch():
+            while not todo.empty():
+                index, dataflow_name, dataflow_id = todo.get_nowait()
+                print(f"📥 Downloading dataflow: {dataflow_name}")
+                if not dataflow_id:
+                    details = {"error": "Must provide either dataflow_name or dataflow_id"}
+                else:
+                    details = await loop.run_in_executor(None, self.get_dataflow_details, workspace_id, dataflow_id)
+                if 'error' in details:
+                    outcomes.append((index, dataflow_name, dataflow_id, details))
+                else:
+                    await fetched.put((index, dataflow_name, dataflow_id, details))
+        
+        async def format_documents(pool):
+            while (item := await fetched.get()) is not None:
+                index, dataflow_name, dataflow_id, details = item
+                formatted_document = None
+                try:
+                    if pool and 'pbi:mashup' in details and 'document' in details['pbi:mashup']:
+                        formatted_document = await loop.run_in_executor(
+                            pool, _format_document_section, details['pbi:mashup']['document'])
+                except Exception as e:
+                    outcomes.append((index, dataflow_name, dataflow_id, {"error": f"Failed to write file: {str(e)}"}))
+                    continue
+                await formatted.put((index, dataflow_name, dataflow_id, details, formatted_document))
+        
+        async def write():
+            while (item := await formatted.get()) is not None:
+                index, dataflow_name, dataflow_id, details, formatted_document = item
+                result = await loop.run_in_executor(None, self._save_dataflow, workspace_id, workspace_name,
+                                                    dataflow_id, details, include_txt, formatted_document)
+                outcomes.append((index, dataflow_name, dataflow_id, result))
+        
+        # Formatting the M document for the .txt report is CPU-bound pure Python
+        # (GIL-bound), so it goes to worker processes; without a report it's a pass-through
+        pool = ProcessPoolExecutor(max_workers=os.cpu_count()) if include_txt else None
+        format_workers = (os.cpu_count() or 1) if pool else 1
+        try:
+            fetchers = [asyncio.create_task(fetch()) for _ in range(self.FETCH_WORKERS)]
+            formatters = [asyncio.create_task(format_documents(pool)) for _ in range(format_workers)]
+            writers = [asyncio.create_task(write()) for _ in range(self.WRITE_WORKERS)]
             
-            if result.get('success'):
-                results['downloaded'].append(result)
-                print(f"   ✅ Downloaded: {result['filename']}")
-            else:
-                results['failed'].append({
-                    'dataflow_name': dataflow_name,
-                    'dataflow_id': dataflow_id,
-                    'error': result.get('error', 'Unknown error')
-                })
-                print(f"   ❌ Failed: {result.get('error', 'Unknown error')}")
-        
+            # Drain the stages in order, then signal the next one with one sentinel per worker
+            await asyncio.gather(*fetchers)
+            for _ in formatters:
+                await fetched.put(None)
+            await asyncio.gather(*formatters)
+            for _ in writers:
+                await formatted.put(None)
+            await asyncio.gather(*writers)
+        finally:
+            if pool:
+                pool.shutdown()
+        
+        # Report in workspace order regardless of which stage finished first
+        for index, dataflow_name, dataflow_id, result in sorted(outcomes, key=lambda outcome: outcome[0]):
+            self._record_download(results, dataflow_name, dataflow_id, result)
         return results
     
+    def _record_download(self, results: Dict, dataflow_name: str, dataflow_id: str, result: Dict) -> None:
+        """Add one dataflow's outcome to the download_all_dataflows summary."""
+        if result.get('success'):
+            results['downloaded'].append(result)
+            print(f"   ✅ Downloaded: {result['filename']}")
+        else:
+            results['failed'].append({
+                'dataflow_name': dataflow_name,
+                'dataflow_id': dataflow_id,
+                'error': result.get('error', 'Unknown error')
+            })
+            print(f"   ❌ Failed: {result.get('error', 'Unknown error')}")
+    
     def _format_document_section(self, document: str) -> str:
         """Format the document section with proper headers and line breaks using advanced cleaning."""
-        if not document:
-            return "No document content available"
-        
-        # The document comes as a JSON string with escaped characters
-        # We need to unescape it first
-        import json
-        import re
-        
-        try:
-            # Unescape the JSON string
-            unescaped_document = json.loads(f'"{document}"')
-        except:
-            # If JSON parsing fails, try direct replacement
-            unescaped_document = document
-        
-        # Replace escaped characters
-        m_code = unescaped_document.replace('\\r\\n', '\r\n')
-        m_code = m_code.replace('\\n', '\n')
-        m_code = m_code.replace('\\t', '\t')
-        m_code = m_code.replace('\\"', '"')
-        
-        # Split by shared sections
-        sections = re.split(r'(\r\nshared\s+\w+\s*=)', m_code)
-        
-        cleaned_content = []
-        
-        # Process the first section (before any shared)
-        if sections[0].strip():
-            cleaned_content.append(sections[0].strip())
-            cleaned_content.append("\n\n")
-        
-        # Process shared sections
-        for i in range(1, len(sections), 2):
-            if i+1 < len(sections):
-                # Extract the shared name
-                shared_match = re.match(r'\r\nshared\s+(\w+)\s*=', sections[i])
-                if shared_match:
-                    shared_name = shared_match.group(1)
-                    
-                    # Add header
-                    cleaned_content.append("=" * 80)
-                    cleaned_content.append(f"\n# SHARED: {shared_name}\n")
-                    cleaned_content.append("=" * 80)
-                    cleaned_content.append("\n\n")
-                    
-                    # Add the shared declaration and its content
-                    cleaned_content.append(f"shared {shared_name} =")
-                    
-                    # Clean up the section content
-                    section_content = sections[i+1]
-                    
-                    # Remove trailing semicolon if it's followed by another shared
-                    if i+2 < len(sections):
-                        section_content = re.sub(r';\s*$', '', section_content)
-                    
-                    cleaned_content.append(section_content)
-                    cleaned_content.append(";\n\n")
-        
-        # Join all cleaned content
-        final_content = ''.join(cleaned_content)
-        
-        # Additional formatting improvements
-        # Fix indentation for let...in blocks
-        final_content = self._format_let_in_blocks(final_content)
-        
-        return final_content
+        return _format_document_section(document)
     
     def _format_let_in_blocks(self, content):
         """Improve formatting of let...in blocks"""
-        lines = content.split('\n')
-        formatted_lines = []
-        indent_level = 0
-        in_let_block = False
-        
-        for line in lines:
-            stripped = line.strip()
-            
-            # Adjust indent level
-            if stripped.startswith('let'):
-                in_let_block = True
-                formatted_lines.append(' ' * indent_level + stripped)
-                indent_level += 4
-            elif stripped == 'in':
-                indent_level -= 4
-                formatted_lines.append(' ' * indent_level + stripped)
-                indent_level += 4
-            elif stripped.startswith('in '):
-                indent_level -= 4
-                formatted_lines.append(' ' * indent_level + stripped)
-                in_let_block = False
-            elif in_let_block and stripped.endswith(','):
-                formatted_lines.append(' ' * indent_level + stripped)
-            elif in_let_block and not stripped:
-                formatted_lines.append('')
-            else:
-                # Check if we're ending a let block
-                if in_let_block and (stripped.endswith(';') or 'in\n' in line):
-                    indent_level = max(0, indent_level - 4)
-                    in_let_block = False
-                formatted_lines.append(' ' * indent_level + stripped)
-        
-        return '\n'.join(formatted_lines)
+        return _format_let_in_blocks(content)
     
     def _get_workspace_name(self, workspace_id: str) -> str:
-        """Get workspace name from workspace ID using Power BI API."""
+        """Get workspace name from workspace ID using Power BI API (cached per workspace)."""
+        cached = self._workspace_name_cache.get(workspace_id)
+        if cached is not None:
+            return cached
+        
         try:
             url = f"{self.base_url}/groups/{workspace_id}"
             result = self.make_request('GET', url)
             if 'error' not in result:
-                return result.get('name', 'Unknown Workspace')
+                name = result.get('name', 'Unknown Workspace')
+                self._workspace_name_cache[workspace_id] = name
+                return name
         except:
             pass
         return "Unknown Workspace"
@@ -377,9 +772,16 @@ def main():
     parser.add_argument('--dataflow-id', help='Specific dataflow ID to download')
     parser.add_argument('--all', action='store_true', help='Download all dataflows in workspace')
     parser.add_argument('--test', action='store_true', help='Test API connection with a simple request')
+    parser.add_argument('--include-txt', action='store_true',
+                        help='Also write the human-readable .txt report (full API response + formatted M code)')
+    parser.add_argument('-v', '--verbose', action='count', default=0,
+                        help='Increase log verbosity (-vv logs every API request)')
     
     args = parser.parse_args()
     
+    log_levels = [logging.WARNING, logging.INFO, logging.DEBUG]
+    logging.basicConfig(level=log_levels[min(args.verbose, len(log_levels) - 1)])
+    
     downloader = DataflowDownloader()
     
     if args.test:
@@ -411,7 +813,7 @@ def main():
     
     if args.all:
         print("🚀 Downloading all dataflows...")
-        result = downloader.download_all_dataflows(args.workspace_id)
+        result = downloader.download_all_dataflows(args.workspace_id, include_txt=args.include_txt)
         
         if result.get('success'):
             print(f"\n✅ Download Complete!")
@@ -441,7 +843,8 @@ def main():
         result = downloader.download_single_dataflow(
             args.workspace_id,
             dataflow_name=args.dataflow_name,
-            dataflow_id=args.dataflow_id
+            dataflow_id=args.dataflow_id,
+            include_txt=args.include_txt
         )
         
         if result.get('success'):
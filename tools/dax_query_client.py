@@ -5,11 +5,311 @@ Uses the TmdlTools.exe with ADOMD.NET for XMLA connectivity.
 Supports INFO.VIEW.* functions for metadata extraction.
 """
 
+import asyncio
+import concurrent.futures
+import functools
+import hashlib
 import json
-import subprocess
+import logging
+import uuid
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, field
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; the stdlib json module is used without it
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional; without it TmdlTools.exe output is buffered before parsing
+    ijson = None
+
+logger = logging.getLogger(__name__)
+
+
+# TmdlTools.exe calls are aborted after this many seconds
+QUERY_TIMEOUT = 300
+
+# At most this much of TmdlTools.exe's stderr is kept for error messages
+STDERR_LIMIT = 64 * 1024
+
+# Largest single response line accepted from a persistent TmdlTools.exe worker
+MAX_RESPONSE_BYTES = 1 << 30
+
+# analyze_live_model results are cached here, keyed by model version
+CACHE_DIR = Path.home() / ".cache" / "dax_query_client"
+
+# One-row probe whose result changes whenever the model is modified
+MODEL_VERSION_QUERY = """
+    EVALUATE
+    SELECTCOLUMNS(
+        INFO.MODEL(),
+        "ModifiedTime", [ModifiedTime],
+        "StructureModifiedTime", [StructureModifiedTime]
+    )"""
+
+
+def _json_loads(data: bytes) -> Any:
+    """Parse TmdlTools.exe output, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize a request for TmdlTools.exe as compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+# TmdlTools.exe build outputs, relative to this file
+_HERE = Path(__file__).parent
+_DEFAULT_EXE_PUBLISHED = _HERE / "tom_interop" / "bin" / "Release" / "net8.0" / "publish" / "TmdlTools.exe"
+_DEFAULT_EXE_UNPUBLISHED = _HERE / "tom_interop" / "bin" / "Release" / "net8.0" / "TmdlTools.exe"
+
+
+def _expand_rows(result_set: Any) -> Any:
+    """
+    Rebuild row dicts for a TmdlTools.exe result set.
+    
+    The exe sends rows as value arrays under "data", in "columns" order; they
+    become {column: value} dicts under "rows". Result sets that already have
+    "rows" (older builds of the exe) are returned unchanged.
+    """
+    if isinstance(result_set, dict) and "data" in result_set and "rows" not in result_set:
+        columns = result_set.get("columns", [])
+        result_set["rows"] = [dict(zip(columns, values)) for values in result_set.pop("data")]
+    return result_set
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_exe_path(override: Optional[str]) -> Path:
+    """
+    Locate TmdlTools.exe, once per distinct override.
+    
+    An explicit override must exist. Without one, the published path is
+    used, falling back to the non-published build output. Failures are not
+    cached, so a later call finds an exe that has been built since.
+    
+    Raises:
+        FileNotFoundError: If the override, or both default paths, are not existing files
+    """
+    if override:
+        exe_path = Path(override)
+        if not exe_path.is_file():
+            raise FileNotFoundError(f"TmdlTools.exe not found at {exe_path} (given as exe_path)")
+        return exe_path
+    
+    # Default to published path
+    exe_path = _DEFAULT_EXE_PUBLISHED
+    
+    if not exe_path.exists():
+        # Try non-published path
+        exe_path = _DEFAULT_EXE_UNPUBLISHED
+    
+    if not exe_path.is_file():
+        raise FileNotFoundError(f"TmdlTools.exe not found at {exe_path}")
+    return exe_path
+
+
+def _check_model_names(workspace: str, dataset: str) -> None:
+    """Reject empty workspace/dataset names before starting TmdlTools.exe."""
+    for label, value in (("workspace", workspace), ("dataset", dataset)):
+        if not isinstance(value, str) or not value.strip():
+            raise ValueError(f"A {label} name is required")
+
+
+async def _read_bounded(stream: asyncio.StreamReader, limit: int) -> bytes:
+    """Drain a stream to EOF, keeping only its first ``limit`` bytes."""
+    kept = bytearray()
+    while True:
+        chunk = await stream.read(65536)
+        if not chunk:
+            return bytes(kept)
+        if len(kept) < limit:
+            kept += chunk[:limit - len(kept)]
+
+
+# Column projections used by TmdlTools.exe get-model-metadata, so that individual
+# sections can also be fetched with a plain "query" call and parse identically
+METADATA_QUERIES = {
+    "tables": """
+        EVALUATE
+        SELECTCOLUMNS(
+            INFO.VIEW.TABLES(),
+            "Name", [Name],
+            "Description", [Description],
+            "IsHidden", [Is Hidden],
+            "StorageMode", [Storage Mode],
+            "Expression", [Expression],
+            "DataCategory", [Data Category]
+        )""",
+    "columns": """
+        EVALUATE
+        SELECTCOLUMNS(
+            INFO.VIEW.COLUMNS(),
+            "Table", [Table],
+            "Name", [Name],
+            "Description", [Description],
+            "DataType", [Data Type],
+            "IsHidden", [Is Hidden],
+            "Expression", [Expression],
+            "DataCategory", [Data Category],
+            "SortByColumn", [Sort By Column],
+            "IsKey", [Is Key],
+            "SummarizeBy", [Summarize By]
+        )""",
+    "measures": """
+        EVALUATE
+        SELECTCOLUMNS(
+            INFO.VIEW.MEASURES(),
+            "Table", [Table],
+            "Name", [Name],
+            "Description", [Description],
+            "Expression", [Expression],
+            "FormatString", [Format String],
+            "IsHidden", [Is Hidden],
+            "DisplayFolder", [Display Folder]
+        )""",
+    "relationships": """
+        EVALUATE
+        SELECTCOLUMNS(
+            INFO.VIEW.RELATIONSHIPS(),
+            "FromTable", [From Table],
+            "FromColumn", [From Column],
+            "ToTable", [To Table],
+            "ToColumn", [To Column],
+            "IsActive", [Is Active],
+            "CrossFilterDirection", [Cross Filter Direction],
+            "Cardinality", [Cardinality],
+            "SecurityFilterDirection", [Security Filter Direction]
+        )""",
+    "hierarchies": """
+        EVALUATE
+        SELECTCOLUMNS(
+            INFO.VIEW.HIERARCHIES(),
+            "Table", [Table],
+            "Name", [Name],
+            "Description", [Description],
+            "IsHidden", [Is Hidden]
+        )""",
+    "dependencies": """
+        EVALUATE
+        INFO.CALCDEPENDENCY()""",
+}
+
+
+class _WorkerStartError(RuntimeError):
+    """A serve worker exited before answering any request (e.g. an older TmdlTools.exe without serve)."""
+
+
+class _TmdlWorker:
+    """
+    A long-lived ``TmdlTools.exe serve`` process for one model.
+    
+    Requests are written to stdin as one JSON object per line
+    ({"id", "method", "params"}); each response line carries the same id with
+    either "result" or "error", so concurrent callers can share the process.
+    """
+    
+    def __init__(self, proc: asyncio.subprocess.Process, token: Optional[str]):
+        self.proc = proc
+        self.token = token
+        self._next_id = 0
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._answered = False
+        self._killed = False
+        self._exit_error: Optional[Exception] = None
+        self._stderr = bytearray()
+        self._stderr_reader = asyncio.create_task(self._read_stderr())
+        self._reader = asyncio.create_task(self._read_responses())
+    
+    @property
+    def alive(self) -> bool:
+        return self.proc.returncode is None and not self._reader.done()
+    
+    async def _read_stderr(self) -> None:
+        while True:
+            chunk = await self.proc.stderr.read(65536)
+            if not chunk:
+                return
+            if len(self._stderr) < STDERR_LIMIT:
+                self._stderr += chunk[:STDERR_LIMIT - len(self._stderr)]
+    
+    async def _read_responses(self) -> None:
+        error: Exception = RuntimeError("TmdlTools.exe worker exited")
+        try:
+            while True:
+                line = await self.proc.stdout.readline()
+                if not line:
+                    # Give stderr a moment to deliver the reason for the exit
+                    await asyncio.wait({self._stderr_reader}, timeout=1)
+                    message = self._stderr.decode(errors="replace").strip() or "TmdlTools.exe worker exited"
+                    if not self._answered and not self._killed:
+                        error = _WorkerStartError(message)
+                    elif self._stderr:
+                        error = RuntimeError(message)
+                    break
+                self._answered = True
+                response = _json_loads(line)
+                future = self._pending.pop(response.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        except Exception as e:
+            error = e
+        finally:
+            self._exit_error = error
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            self._pending.clear()
+    
+    async def request(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Send one request and wait for its response."""
+        if not self.alive:
+            await asyncio.wait({self._reader}, timeout=5)
+            raise self._exit_error or RuntimeError("TmdlTools.exe worker is not running")
+        
+        request_id = self._next_id
+        self._next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            try:
+                self.proc.stdin.write(
+                    _json_dumps({"id": request_id, "method": method, "params": params}) + b"\n"
+                )
+                await self.proc.stdin.drain()
+            except ConnectionError:
+                # The process has exited; once the reader sees EOF it fails this
+                # request with whatever the process wrote to stderr
+                await asyncio.wait({self._reader}, timeout=5)
+            return await future
+        finally:
+            self._pending.pop(request_id, None)
+    
+    async def kill(self) -> None:
+        """Stop the process immediately; pending requests fail."""
+        if self.proc.returncode is None:
+            self._killed = True
+            self.proc.kill()
+            await self.proc.wait()
+    
+    async def close(self) -> None:
+        """Ask the process to exit by closing stdin, killing it if it doesn't."""
+        if self.proc.returncode is None:
+            self.proc.stdin.close()
+            try:
+                await asyncio.wait_for(self.proc.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                self.proc.kill()
+                await self.proc.wait()
+        await asyncio.wait({self._reader, self._stderr_reader}, timeout=1)
+        self._reader.cancel()
+        self._stderr_reader.cancel()
 
 
 @dataclass
@@ -20,6 +320,206 @@ class DaxQueryResult:
     rows: List[Dict[str, Any]]
     row_count: int
     error: Optional[str] = None
+    # One {columns, rows, rowCount} dict per EVALUATE statement in the query
+    result_sets: List[Dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class Column:
+    """A column of a live model table."""
+    name: Optional[str] = None
+    description: Optional[str] = None
+    data_type: Optional[str] = None
+    is_hidden: bool = False
+    expression: Optional[str] = None
+    data_category: Optional[str] = None
+    is_key: bool = False
+    summarize_by: Optional[str] = None
+    is_calculated: bool = False
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "description": self.description,
+            "data_type": self.data_type,
+            "is_hidden": self.is_hidden,
+            "expression": self.expression,
+            "data_category": self.data_category,
+            "is_key": self.is_key,
+            "summarize_by": self.summarize_by,
+            "is_calculated": self.is_calculated
+        }
+
+
+@dataclass(slots=True)
+class Measure:
+    """A measure of a live model table."""
+    name: Optional[str] = None
+    description: Optional[str] = None
+    expression: Optional[str] = None
+    format_string: Optional[str] = None
+    is_hidden: bool = False
+    display_folder: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "description": self.description,
+            "expression": self.expression,
+            "format_string": self.format_string,
+            "is_hidden": self.is_hidden,
+            "display_folder": self.display_folder
+        }
+
+
+@dataclass(slots=True)
+class Relationship:
+    """A relationship between two live model tables."""
+    from_table: Optional[str] = None
+    from_column: Optional[str] = None
+    to_table: Optional[str] = None
+    to_column: Optional[str] = None
+    is_active: bool = True
+    cross_filter_direction: str = "single"
+    cardinality: str = ""
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "from_table": self.from_table,
+            "from_column": self.from_column,
+            "to_table": self.to_table,
+            "to_column": self.to_column,
+            "is_active": self.is_active,
+            "cross_filter_direction": self.cross_filter_direction,
+            "cardinality": self.cardinality
+        }
+
+
+@dataclass(slots=True)
+class Table:
+    """A live model table with its columns and measures."""
+    name: Optional[str] = None
+    description: Optional[str] = None
+    is_hidden: bool = False
+    storage_mode: Optional[str] = None
+    expression: Optional[str] = None
+    data_category: Optional[str] = None
+    columns: List[Column] = field(default_factory=list)
+    measures: List[Measure] = field(default_factory=list)
+    # Subset of columns that have a DAX expression
+    calculated_columns: List[Column] = field(default_factory=list)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-dict form; calculated_columns share dicts with columns."""
+        column_dicts = {id(column): column.to_dict() for column in self.columns}
+        return {
+            "name": self.name,
+            "description": self.description,
+            "is_hidden": self.is_hidden,
+            "storage_mode": self.storage_mode,
+            "expression": self.expression,
+            "data_category": self.data_category,
+            "columns": list(column_dicts.values()),
+            "measures": [measure.to_dict() for measure in self.measures],
+            "calculated_columns": [
+                column_dicts.get(id(column)) or column.to_dict()
+                for column in self.calculated_columns
+            ]
+        }
+
+
+def build_live_model(metadata: Dict[str, Any]) -> Tuple[List[Table], List[Relationship]]:
+    """
+    Build typed tables and relationships from get_full_model_metadata output.
+    
+    analyze_live_model returns these converted with to_dict(); callers that hold
+    the metadata themselves can use the objects directly.
+    
+    Args:
+        metadata: Metadata sections, each {"columns", "rows", "rowCount"}
+    
+    Returns:
+        (tables, relationships)
+    """
+    tables: List[Table] = []
+    relationships: List[Relationship] = []
+    
+    # Process tables
+    tables_data = metadata.get("tables", {})
+    if isinstance(tables_data, dict) and "rows" in tables_data:
+        for row in tables_data["rows"]:
+            tables.append(Table(
+                name=row.get("Name"),
+                description=row.get("Description"),
+                is_hidden=row.get("IsHidden", False),
+                storage_mode=row.get("StorageMode"),
+                expression=row.get("Expression"),
+                data_category=row.get("DataCategory")
+            ))
+    
+    # Index tables by name; the first table with a given name wins
+    tables_by_name: Dict[Optional[str], Table] = {}
+    for table in tables:
+        tables_by_name.setdefault(table.name, table)
+    
+    # Process columns and add to tables
+    columns_data = metadata.get("columns", {})
+    if isinstance(columns_data, dict) and "rows" in columns_data:
+        for row in columns_data["rows"]:
+            # Find the table; columns of unknown tables are skipped unbuilt
+            table = tables_by_name.get(row.get("Table"))
+            if table is None:
+                continue
+            
+            expression = row.get("Expression")
+            column = Column(
+                name=row.get("Name"),
+                description=row.get("Description"),
+                data_type=row.get("DataType"),
+                is_hidden=row.get("IsHidden", False),
+                expression=expression,
+                data_category=row.get("DataCategory"),
+                is_key=row.get("IsKey", False),
+                summarize_by=row.get("SummarizeBy"),
+                is_calculated=bool(expression)
+            )
+            table.columns.append(column)
+            if column.is_calculated:
+                table.calculated_columns.append(column)
+    
+    # Process measures and add to tables
+    measures_data = metadata.get("measures", {})
+    if isinstance(measures_data, dict) and "rows" in measures_data:
+        for row in measures_data["rows"]:
+            # Find the table; measures of unknown tables are skipped unbuilt
+            table = tables_by_name.get(row.get("Table"))
+            if table is None:
+                continue
+            
+            table.measures.append(Measure(
+                name=row.get("Name"),
+                description=row.get("Description"),
+                expression=row.get("Expression"),
+                format_string=row.get("FormatString"),
+                is_hidden=row.get("IsHidden", False),
+                display_folder=row.get("DisplayFolder")
+            ))
+    
+    # Process relationships
+    rels_data = metadata.get("relationships", {})
+    if isinstance(rels_data, dict) and "rows" in rels_data:
+        for row in rels_data["rows"]:
+            relationships.append(Relationship(
+                from_table=row.get("FromTable"),
+                from_column=row.get("FromColumn"),
+                to_table=row.get("ToTable"),
+                to_column=row.get("ToColumn"),
+                is_active=row.get("IsActive", True),
+                cross_filter_direction=row.get("CrossFilterDirection", "single").lower(),
+                cardinality=row.get("Cardinality", "").lower().replace(" ", "-")
+            ))
+    
+    return tables, relationships
 
 
 class DaxQueryClient:
@@ -27,26 +527,296 @@ class DaxQueryClient:
     Client for executing DAX queries against Power BI semantic models.
     
     Uses INFO.VIEW.* functions to extract model metadata for analysis.
+    
+    The query methods are coroutines that talk to TmdlTools.exe as an asyncio
+    subprocess, so several queries (or models) can be awaited concurrently
+    with ``asyncio.gather``. Each has a ``*_sync`` counterpart for callers
+    without an event loop.
+    
+    By default one persistent ``TmdlTools.exe serve`` worker is kept per
+    (workspace, dataset), so only the first query to a model pays for process
+    startup and authentication. Use ``async with`` or ``aclose()`` to stop the
+    workers when done.
     """
     
-    def __init__(self, exe_path: Optional[str] = None):
+    def __init__(
+        self,
+        exe_path: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+        persistent: bool = True
+    ):
         """
         Initialize the DAX query client.
         
         Args:
             exe_path: Path to TmdlTools.exe. Defaults to relative path from this file.
+            cache_dir: Directory for cached analyze_live_model results. Defaults to CACHE_DIR.
+            persistent: Reuse a TmdlTools.exe serve worker per model. If False, every
+                call starts a new TmdlTools.exe process.
+        
+        Raises:
+            FileNotFoundError: If TmdlTools.exe cannot be found
         """
-        if exe_path:
-            self.exe_path = Path(exe_path)
-        else:
-            # Default to published path relative to this file
-            self.exe_path = Path(__file__).parent / "tom_interop" / "bin" / "Release" / "net8.0" / "publish" / "TmdlTools.exe"
+        self.persistent = persistent
+        self._workers: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._worker_locks: Dict[Tuple[str, str], Tuple[asyncio.AbstractEventLoop, asyncio.Lock]] = {}
+        
+        # Created on the first cache write, so cache=False callers never touch the disk
+        self.cache_dir = Path(cache_dir) if cache_dir else CACHE_DIR
+        
+        self.exe_path = _resolve_exe_path(str(exe_path) if exe_path else None)
+    
+    async def __aenter__(self) -> "DaxQueryClient":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+    
+    async def aclose(self) -> None:
+        """Stop all persistent TmdlTools.exe workers."""
+        for workspace, dataset in list(self._workers):
+            await self._close_worker(workspace, dataset)
+    
+    async def _close_worker(self, workspace: str, dataset: str) -> None:
+        """Stop the persistent worker for one model, if there is one."""
+        starting = self._workers.pop((workspace, dataset), None)
+        if starting is None or starting.get_loop() is not asyncio.get_running_loop():
+            return  # none, or it belongs to an event loop that has already finished
+        try:
+            worker = await starting
+        except Exception:
+            return
+        await worker.close()
+    
+    async def _start_worker(
+        self,
+        workspace: str,
+        dataset: str,
+        token: Optional[str]
+    ) -> _TmdlWorker:
+        cmd = [
+            str(self.exe_path),
+            "serve",
+            "--workspace", workspace,
+            "--dataset", dataset
+        ]
+        
+        if token:
+            cmd.extend(["--token", token])
         
-        if not self.exe_path.exists():
-            # Try non-published path
-            self.exe_path = Path(__file__).parent / "tom_interop" / "bin" / "Release" / "net8.0" / "TmdlTools.exe"
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=MAX_RESPONSE_BYTES
+        )
+        return _TmdlWorker(proc, token)
     
-    def execute_query(
+    def _worker_lock(self, key: Tuple[str, str]) -> asyncio.Lock:
+        """Return the lock serializing worker (re)starts for one model in the running event loop."""
+        loop = asyncio.get_running_loop()
+        entry = self._worker_locks.get(key)
+        if entry is None or entry[0] is not loop:
+            entry = self._worker_locks[key] = (loop, asyncio.Lock())
+        return entry[1]
+    
+    async def _ensure_worker(
+        self,
+        workspace: str,
+        dataset: str,
+        token: Optional[str]
+    ) -> _TmdlWorker:
+        """Return the running worker for a model, starting (or restarting) it if needed."""
+        key = (workspace, dataset)
+        # Checked under the lock: two callers finding the same dead worker must not both restart it
+        async with self._worker_lock(key):
+            starting = self._workers.get(key)
+            
+            if starting is not None:
+                if starting.get_loop() is not asyncio.get_running_loop():
+                    starting = None  # left over from an earlier event loop
+                elif starting.done():
+                    if starting.cancelled() or starting.exception() is not None:
+                        starting = None
+                    else:
+                        worker = starting.result()
+                        if not worker.alive or worker.token != token:
+                            await worker.close()
+                            starting = None
+            
+            if starting is None:
+                starting = asyncio.ensure_future(self._start_worker(workspace, dataset, token))
+                self._workers[key] = starting
+        return await starting
+    
+    async def _rpc(
+        self,
+        workspace: str,
+        dataset: str,
+        method: str,
+        params: Dict[str, Any],
+        token: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Send one request to the model's persistent worker.
+        
+        Returns:
+            The response object, holding either "result" or "error"
+        
+        Raises:
+            asyncio.TimeoutError: If no response arrives within QUERY_TIMEOUT (the worker is killed)
+            _WorkerStartError: If the worker exits before answering its first request
+        """
+        worker = await self._ensure_worker(workspace, dataset, token)
+        try:
+            return await asyncio.wait_for(worker.request(method, params), timeout=QUERY_TIMEOUT)
+        except asyncio.TimeoutError:
+            await worker.kill()
+            raise
+    
+    async def _call(
+        self,
+        method: str,
+        workspace: str,
+        dataset: str,
+        token: Optional[str] = None,
+        **params: str
+    ) -> Tuple[Any, Optional[str]]:
+        """
+        Run a TmdlTools.exe command, via the persistent worker or a new process.
+        
+        Keyword params become request params for the worker, or ``--name value``
+        options for a one-off process. If the worker exits before answering (an
+        older TmdlTools.exe without the serve command), the client switches to
+        one-off processes as if created with persistent=False.
+        
+        Returns:
+            (parsed output, None) on success, or (None, error message)
+        
+        Raises:
+            ValueError: If the workspace or dataset name is empty
+        """
+        _check_model_names(workspace, dataset)
+        
+        if self.persistent:
+            try:
+                response = await self._rpc(workspace, dataset, method, params, token)
+            except _WorkerStartError as e:
+                logger.warning("TmdlTools.exe serve worker did not start, running one process per call: %s", e)
+                self.persistent = False
+            else:
+                if "error" in response:
+                    return None, response["error"]
+                return response["result"], None
+        
+        cmd = [
+            str(self.exe_path),
+            method,
+            "--workspace", workspace,
+            "--dataset", dataset
+        ]
+        for name, value in params.items():
+            cmd.extend([f"--{name}", value])
+        
+        if token:
+            cmd.extend(["--token", token])
+        
+        returncode, data, error_output = await self._run_exe_json(cmd)
+        if returncode != 0:
+            return None, error_output.decode(errors="replace")
+        return data, None
+    
+    async def _run_exe(self, cmd: List[str]) -> Tuple[int, bytes, bytes]:
+        """
+        Run TmdlTools.exe without blocking the event loop.
+        
+        Output is returned undecoded so JSON can be parsed straight from bytes.
+        
+        Returns:
+            (returncode, stdout, stderr)
+        
+        Raises:
+            asyncio.TimeoutError: If the process runs longer than QUERY_TIMEOUT (it is killed)
+        """
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=QUERY_TIMEOUT)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            raise
+        return proc.returncode, stdout, stderr
+    
+    async def _run_exe_json(self, cmd: List[str]) -> Tuple[int, Any, bytes]:
+        """
+        Run TmdlTools.exe and parse the JSON object it writes to stdout.
+        
+        With ijson installed the object is parsed while it streams from the pipe,
+        so the raw payload is never held in memory next to the parsed result.
+        Otherwise stdout is buffered and parsed with _json_loads.
+        
+        Returns:
+            (returncode, parsed output, error output); parsed output is None
+            when the process failed
+        
+        Raises:
+            asyncio.TimeoutError: If the process runs longer than QUERY_TIMEOUT (it is killed)
+        """
+        if ijson is None:
+            returncode, stdout, stderr = await self._run_exe(cmd)
+            if returncode != 0:
+                return returncode, None, stderr or stdout
+            return returncode, _json_loads(stdout), stderr
+        
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        
+        async def parse_stdout() -> Dict[str, Any]:
+            try:
+                return {
+                    key: value
+                    async for key, value in ijson.kvitems_async(proc.stdout, "", use_float=True)
+                }
+            finally:
+                # Drain anything left unparsed so the process can exit
+                await proc.stdout.read()
+        
+        async def communicate():
+            results = await asyncio.gather(
+                parse_stdout(),
+                _read_bounded(proc.stderr, STDERR_LIMIT),
+                return_exceptions=True
+            )
+            await proc.wait()
+            return results
+        
+        try:
+            data, stderr = await asyncio.wait_for(communicate(), timeout=QUERY_TIMEOUT)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            raise
+        
+        if isinstance(stderr, BaseException):
+            stderr = b""
+        if proc.returncode != 0:
+            return proc.returncode, None, stderr
+        if isinstance(data, ijson.JSONError):
+            # Surface as a parse failure, like json/orjson decode errors
+            raise ValueError(str(data)) from data
+        if isinstance(data, BaseException):
+            raise data
+        return proc.returncode, data, stderr
+    
+    async def execute_query(
         self, 
         workspace: str, 
         dataset: str, 
@@ -65,43 +835,47 @@ class DaxQueryClient:
         Returns:
             DaxQueryResult with columns, rows, and metadata
         """
-        cmd = [
-            str(self.exe_path),
-            "query",
-            "--workspace", workspace,
-            "--dataset", dataset,
-            "--dax", dax_query
-        ]
-        
-        if token:
-            cmd.extend(["--token", token])
-        
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minute timeout
+            _check_model_names(workspace, dataset)
+            if not dax_query or not dax_query.strip():
+                raise ValueError("Empty DAX query")
+        except ValueError as e:
+            return DaxQueryResult(
+                success=False,
+                columns=[],
+                rows=[],
+                row_count=0,
+                error=str(e)
             )
+        
+        try:
+            data, error = await self._call("query", workspace, dataset, token, dax=dax_query)
             
-            if result.returncode != 0:
+            if error is not None:
                 return DaxQueryResult(
                     success=False,
                     columns=[],
                     rows=[],
                     row_count=0,
-                    error=result.stderr or result.stdout
+                    error=error
                 )
             
-            data = json.loads(result.stdout)
+            # "resultSets" is only sent for multi-statement queries; the top-level
+            # columns/rows/row_count then describe the first statement
+            result_sets = data.get("resultSets") or [data]
+            for result_set in result_sets:
+                _expand_rows(result_set)
+            first = result_sets[0]
+            
             return DaxQueryResult(
                 success=True,
-                columns=data.get("columns", []),
-                rows=data.get("rows", []),
-                row_count=data.get("rowCount", 0)
+                columns=first.get("columns", []),
+                rows=first.get("rows", []),
+                row_count=first.get("rowCount", 0),
+                result_sets=result_sets
             )
             
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             return DaxQueryResult(
                 success=False,
                 columns=[],
@@ -109,7 +883,7 @@ class DaxQueryClient:
                 row_count=0,
                 error="Query timed out after 5 minutes"
             )
-        except json.JSONDecodeError as e:
+        except (json.JSONDecodeError, ValueError) as e:  # orjson raises a ValueError subclass
             return DaxQueryResult(
                 success=False,
                 columns=[],
@@ -126,7 +900,7 @@ class DaxQueryClient:
                 error=str(e)
             )
     
-    def get_dax_documentation(
+    async def get_dax_documentation(
         self, 
         workspace: str, 
         dataset: str,
@@ -148,6 +922,50 @@ class DaxQueryClient:
         Returns:
             Dictionary with all DAX expressions and their metadata
         """
+        try:
+            data, error = await self._call("get-dax-docs", workspace, dataset, token)
+            
+            if error is not None:
+                return {"error": error}
+            
+            return _expand_rows(data)
+            
+        except asyncio.TimeoutError:
+            return {"error": "Query timed out after 5 minutes"}
+        except Exception as e:
+            return {"error": str(e)}
+    
+    async def get_dax_documentation_bytes(
+        self,
+        workspace: str,
+        dataset: str,
+        token: Optional[str] = None
+    ) -> bytes:
+        """
+        Get the get_dax_documentation JSON exactly as TmdlTools.exe writes it.
+        
+        For callers that store or forward the document without inspecting it,
+        this skips parsing it into dicts and serializing it again. It always
+        runs a one-off TmdlTools.exe process, since worker responses are
+        wrapped in a request envelope.
+        
+        Rows are in the exe's compact layout: value arrays under "data", in the
+        order of "columns", rather than the "rows" dicts get_dax_documentation returns.
+        
+        Args:
+            workspace: Power BI workspace name
+            dataset: Dataset name
+            token: Optional access token
+        
+        Returns:
+            UTF-8 encoded JSON document
+        
+        Raises:
+            ValueError: If the workspace or dataset name is empty
+            RuntimeError: If TmdlTools.exe fails or times out
+        """
+        _check_model_names(workspace, dataset)
+        
         cmd = [
             str(self.exe_path),
             "get-dax-docs",
@@ -159,26 +977,20 @@ class DaxQueryClient:
             cmd.extend(["--token", token])
         
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=300
-            )
-            
-            if result.returncode != 0:
-                return {"error": result.stderr or result.stdout}
-            
-            return json.loads(result.stdout)
-            
-        except Exception as e:
-            return {"error": str(e)}
+            returncode, stdout, stderr = await self._run_exe(cmd)
+        except asyncio.TimeoutError:
+            raise RuntimeError("Query timed out after 5 minutes") from None
+        
+        if returncode != 0:
+            raise RuntimeError((stderr or stdout).decode(errors="replace"))
+        return stdout
     
-    def get_full_model_metadata(
+    async def get_full_model_metadata(
         self, 
         workspace: str, 
         dataset: str,
-        token: Optional[str] = None
+        token: Optional[str] = None,
+        batched: bool = True
     ) -> Dict[str, Any]:
         """
         Get comprehensive model metadata using INFO.VIEW functions.
@@ -191,45 +1003,107 @@ class DaxQueryClient:
         - Hierarchies (INFO.VIEW.HIERARCHIES)
         - Calculation Dependencies (INFO.CALCDEPENDENCY)
         
+        By default all sections are fetched as one multi-EVALUATE query. If that
+        fails (e.g. a model without INFO.CALCDEPENDENCY support, or an older
+        TmdlTools.exe that does not emit "resultSets") the get-model-metadata
+        command is used, which runs each section separately.
+        
         Args:
             workspace: Power BI workspace name
             dataset: Dataset name
             token: Optional access token
+            batched: Set to False to always use the per-section command
         
         Returns:
             Dictionary with all model metadata
         """
-        cmd = [
-            str(self.exe_path),
-            "get-model-metadata",
-            "--workspace", workspace,
-            "--dataset", dataset
-        ]
+        if batched:
+            result = await self.execute_query(
+                workspace, dataset, INFO_VIEW_QUERIES["full_metadata_batch"], token
+            )
+            if result.success and len(result.result_sets) == len(METADATA_QUERIES):
+                return dict(zip(METADATA_QUERIES, result.result_sets))
         
-        if token:
-            cmd.extend(["--token", token])
+        try:
+            data, error = await self._call("get-model-metadata", workspace, dataset, token)
+            
+            if error is not None:
+                return {"error": error}
+            
+            return {section: _expand_rows(value) for section, value in data.items()}
+            
+        except asyncio.TimeoutError:
+            return {"error": "Query timed out after 5 minutes"}
+        except Exception as e:
+            return {"error": str(e)}
+    
+    async def get_dax_docs_and_metadata(
+        self,
+        workspace: str,
+        dataset: str,
+        token: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Get DAX documentation and full model metadata in one TmdlTools.exe call.
+        
+        Both are read over a single XMLA connection, so a combined DAX audit and
+        structural analysis pays for connection setup and auth once.
+        
+        Args:
+            workspace: Power BI workspace name
+            dataset: Dataset name
+            token: Optional access token
         
+        Returns:
+            {"dax_docs": get_dax_documentation result,
+             "metadata": get_full_model_metadata result}
+        """
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=300
-            )
+            data, error = await self._call("combined", workspace, dataset, token)
             
-            if result.returncode != 0:
-                return {"error": result.stderr or result.stdout}
+            if error is not None:
+                return {"error": error}
             
-            return json.loads(result.stdout)
+            return {
+                "dax_docs": _expand_rows(data.get("dax_docs")),
+                "metadata": {
+                    section: _expand_rows(value)
+                    for section, value in (data.get("metadata") or {}).items()
+                }
+            }
             
+        except asyncio.TimeoutError:
+            return {"error": "Query timed out after 5 minutes"}
         except Exception as e:
             return {"error": str(e)}
     
-    def analyze_live_model(
+    async def _get_model_version(
+        self,
+        workspace: str,
+        dataset: str,
+        token: Optional[str] = None
+    ) -> Optional[str]:
+        """Return a string identifying the model's current version, or None if it can't be read."""
+        result = await self.execute_query(workspace, dataset, MODEL_VERSION_QUERY, token)
+        if not result.success or not result.rows:
+            return None
+        return json.dumps(result.rows, sort_keys=True, default=str)
+    
+    def _cache_path(self, workspace: str, dataset: str, version: str) -> Path:
+        """Cache file for one version of a model."""
+        key = hashlib.blake2b(digest_size=16)
+        for part in (workspace, dataset, version):
+            key.update(part.encode("utf-8"))
+            key.update(b"\0")
+        return self.cache_dir / f"{key.hexdigest()}.json"
+    
+    async def analyze_live_model(
         self, 
         workspace: str, 
         dataset: str,
-        token: Optional[str] = None
+        token: Optional[str] = None,
+        cache: bool = True,
+        include_dax_docs: bool = False
     ) -> Dict[str, Any]:
         """
         Analyze a live model using INFO.VIEW functions.
@@ -237,104 +1111,193 @@ class DaxQueryClient:
         This is more reliable than parsing TMDL files because it queries
         the actual model state.
         
+        With cache enabled, a one-row INFO.MODEL() probe identifies the model
+        version; if this version was analyzed before, the result is read from
+        cache_dir instead of re-fetching the full metadata.
+        
         Args:
             workspace: Power BI workspace name
             dataset: Dataset name
             token: Optional access token
+            cache: Set to False to always fetch from the model
+            include_dax_docs: Also add the get_dax_documentation result as "dax_docs",
+                fetched together with the metadata in one call
         
         Returns:
             Analysis-ready model data structure
         """
-        # Get full metadata
-        metadata = self.get_full_model_metadata(workspace, dataset, token)
+        if not cache:
+            return await self._analyze_live_model_uncached(
+                workspace, dataset, token, include_dax_docs
+            )
+        
+        version = await self._get_model_version(workspace, dataset, token)
+        if version is None:
+            return await self._analyze_live_model_uncached(
+                workspace, dataset, token, include_dax_docs
+            )
+        
+        if include_dax_docs:
+            version += "|dax_docs"
+        cache_file = self._cache_path(workspace, dataset, version)
+        try:
+            return _json_loads(cache_file.read_bytes())
+        except (OSError, ValueError):
+            pass  # not cached yet, or unreadable
+        
+        model_data = await self._analyze_live_model_uncached(
+            workspace, dataset, token, include_dax_docs
+        )
+        if "error" not in model_data:
+            self._write_cache(cache_file, model_data)
+        return model_data
+    
+    def _write_cache(self, cache_file: Path, model_data: Dict[str, Any]) -> None:
+        """
+        Atomically store an analysis result; failures are logged, not raised.
+        
+        The analysis already succeeded, so a read-only or full disk only costs
+        the cache. Each writer uses its own temp file so concurrent writes of
+        the same model cannot interleave.
+        """
+        tmp_file = cache_file.with_name(f"{cache_file.stem}.{uuid.uuid4().hex}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            if orjson is not None:
+                tmp_file.write_bytes(orjson.dumps(model_data))
+            else:
+                tmp_file.write_text(json.dumps(model_data), encoding="utf-8")
+            tmp_file.replace(cache_file)
+        except OSError as e:
+            logger.warning("Could not write analysis cache %s: %s", cache_file, e)
+            try:
+                tmp_file.unlink()
+            except OSError:
+                pass
+    
+    async def _analyze_live_model_uncached(
+        self,
+        workspace: str,
+        dataset: str,
+        token: Optional[str] = None,
+        include_dax_docs: bool = False
+    ) -> Dict[str, Any]:
+        """Fetch the model metadata and transform it for analysis."""
+        # Get full metadata. With DAX docs requested both come from one combined call;
+        # otherwise all sections come from one batched query.
+        dax_docs = None
+        if include_dax_docs:
+            combined = await self.get_dax_docs_and_metadata(workspace, dataset, token)
+            if "error" in combined:
+                return combined
+            dax_docs = combined.get("dax_docs")
+            metadata = combined.get("metadata", {})
+        else:
+            metadata = await self.get_full_model_metadata(workspace, dataset, token)
         
         if "error" in metadata:
             return metadata
         
         # Transform into analysis-friendly format
+        tables, relationships = build_live_model(metadata)
         model_data = {
-            "tables": [],
-            "relationships": [],
+            "tables": [table.to_dict() for table in tables],
+            "relationships": [rel.to_dict() for rel in relationships],
             "source": "live_xmla"
         }
         
-        # Process tables
-        tables_data = metadata.get("tables", {})
-        if isinstance(tables_data, dict) and "rows" in tables_data:
-            for row in tables_data["rows"]:
-                model_data["tables"].append({
-                    "name": row.get("Name"),
-                    "description": row.get("Description"),
-                    "is_hidden": row.get("IsHidden", False),
-                    "storage_mode": row.get("StorageMode"),
-                    "expression": row.get("Expression"),
-                    "data_category": row.get("DataCategory"),
-                    "columns": [],
-                    "measures": []
-                })
-        
-        # Process columns and add to tables
-        columns_data = metadata.get("columns", {})
-        if isinstance(columns_data, dict) and "rows" in columns_data:
-            for row in columns_data["rows"]:
-                table_name = row.get("Table")
-                column = {
-                    "name": row.get("Name"),
-                    "description": row.get("Description"),
-                    "data_type": row.get("DataType"),
-                    "is_hidden": row.get("IsHidden", False),
-                    "expression": row.get("Expression"),
-                    "data_category": row.get("DataCategory"),
-                    "is_key": row.get("IsKey", False),
-                    "summarize_by": row.get("SummarizeBy"),
-                    "is_calculated": bool(row.get("Expression"))
-                }
-                
-                # Find the table and add the column
-                for table in model_data["tables"]:
-                    if table["name"] == table_name:
-                        table["columns"].append(column)
-                        if column["is_calculated"]:
-                            if "calculated_columns" not in table:
-                                table["calculated_columns"] = []
-                            table["calculated_columns"].append(column)
-                        break
-        
-        # Process measures and add to tables
-        measures_data = metadata.get("measures", {})
-        if isinstance(measures_data, dict) and "rows" in measures_data:
-            for row in measures_data["rows"]:
-                table_name = row.get("Table")
-                measure = {
-                    "name": row.get("Name"),
-                    "description": row.get("Description"),
-                    "expression": row.get("Expression"),
-                    "format_string": row.get("FormatString"),
-                    "is_hidden": row.get("IsHidden", False),
-                    "display_folder": row.get("DisplayFolder")
-                }
-                
-                # Find the table and add the measure
-                for table in model_data["tables"]:
-                    if table["name"] == table_name:
-                        table["measures"].append(measure)
-                        break
-        
-        # Process relationships
-        rels_data = metadata.get("relationships", {})
-        if isinstance(rels_data, dict) and "rows" in rels_data:
-            for row in rels_data["rows"]:
-                model_data["relationships"].append({
-                    "from_table": row.get("FromTable"),
-                    "from_column": row.get("FromColumn"),
-                    "to_table": row.get("ToTable"),
-                    "to_column": row.get("ToColumn"),
-                    "is_active": row.get("IsActive", True),
-                    "cross_filter_direction": row.get("CrossFilterDirection", "single").lower(),
-                    "cardinality": row.get("Cardinality", "").lower().replace(" ", "-")
-                })
+        if include_dax_docs:
+            model_data["dax_docs"] = dax_docs
         
         return model_data
+    
+    async def analyze_models_bulk(
+        self,
+        pairs: List[Tuple[str, str]],
+        token: Optional[str] = None,
+        max_concurrency: int = 10
+    ) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Analyze many live models concurrently.
+        
+        The Power BI XMLA endpoint allows about 10 parallel requests per source,
+        so by default at most 10 models are analyzed at once. Each model's
+        persistent worker is stopped once its analysis is done, so at most
+        max_concurrency TmdlTools.exe processes run at a time. Repeated pairs
+        are analyzed once.
+        
+        Args:
+            pairs: (workspace, dataset) names to analyze
+            token: Optional access token, shared by all models
+            max_concurrency: Maximum number of models analyzed at the same time
+        
+        Returns:
+            (workspace, dataset, analyze_live_model result) in the order of pairs
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def analyze_one(workspace: str, dataset: str) -> Tuple[str, str, Dict[str, Any]]:
+            async with semaphore:
+                try:
+                    result = await self.analyze_live_model(workspace, dataset, token)
+                finally:
+                    await self._close_worker(workspace, dataset)
+                return workspace, dataset, result
+        
+        # A duplicate pair would close the worker its twin is still using
+        unique_pairs = list(dict.fromkeys((workspace, dataset) for workspace, dataset in pairs))
+        results = await asyncio.gather(*[
+            analyze_one(workspace, dataset) for workspace, dataset in unique_pairs
+        ])
+        by_pair = dict(zip(unique_pairs, results))
+        return [by_pair[(workspace, dataset)] for workspace, dataset in pairs]
+    
+    def _run_sync(self, coro):
+        """
+        Run a coroutine to completion, stopping the workers it started.
+        
+        From inside a running event loop (a notebook, an async web handler) the
+        coroutine runs on a worker thread, since asyncio.run() cannot nest.
+        """
+        async def run():
+            try:
+                return await coro
+            finally:
+                await self.aclose()
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(run())
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, run()).result()
+    
+    def execute_query_sync(self, *args, **kwargs) -> DaxQueryResult:
+        """Blocking wrapper around execute_query."""
+        return self._run_sync(self.execute_query(*args, **kwargs))
+    
+    def get_dax_documentation_sync(self, *args, **kwargs) -> Dict[str, Any]:
+        """Blocking wrapper around get_dax_documentation."""
+        return self._run_sync(self.get_dax_documentation(*args, **kwargs))
+    
+    def get_dax_docs_and_metadata_sync(self, *args, **kwargs) -> Dict[str, Any]:
+        """Blocking wrapper around get_dax_docs_and_metadata."""
+        return self._run_sync(self.get_dax_docs_and_metadata(*args, **kwargs))
+    
+    def get_dax_documentation_bytes_sync(self, *args, **kwargs) -> bytes:
+        """Blocking wrapper around get_dax_documentation_bytes."""
+        return self._run_sync(self.get_dax_documentation_bytes(*args, **kwargs))
+    
+    def get_full_model_metadata_sync(self, *args, **kwargs) -> Dict[str, Any]:
+        """Blocking wrapper around get_full_model_metadata."""
+        return self._run_sync(self.get_full_model_metadata(*args, **kwargs))
+    
+    def analyze_live_model_sync(self, *args, **kwargs) -> Dict[str, Any]:
+        """Blocking wrapper around analyze_live_model."""
+        return self._run_sync(self.analyze_live_model(*args, **kwargs))
+    
+    def analyze_models_bulk_sync(self, *args, **kwargs) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Blocking wrapper around analyze_models_bulk."""
+        return self._run_sync(self.analyze_models_bulk(*args, **kwargs))
 
 
 # Convenience function for quick analysis
@@ -351,12 +1314,14 @@ def analyze_model(workspace: str, dataset: str, token: Optional[str] = None) ->
         Model data ready for analysis
     """
     client = DaxQueryClient()
-    return client.analyze_live_model(workspace, dataset, token)
+    return client.analyze_live_model_sync(workspace, dataset, token)
 
 
 # Common INFO.VIEW queries for reference
 INFO_VIEW_QUERIES = {
-    "all_dax": """
+    # Whitespace is collapsed at import to keep the query text small; none of its
+    # string literals contain whitespace
+    "all_dax": " ".join("""
         VAR __measures =
             SELECTCOLUMNS (
                 INFO.VIEW.MEASURES (),
@@ -386,7 +1351,7 @@ INFO_VIEW_QUERIES = {
             )
         RETURN
             UNION ( __measures, __columns, __tables )
-    """,
+    """.split()),
     
     "tables": "EVALUATE INFO.VIEW.TABLES()",
     "columns": "EVALUATE INFO.VIEW.COLUMNS()",
@@ -395,4 +1360,7 @@ INFO_VIEW_QUERIES = {
     "hierarchies": "EVALUATE INFO.VIEW.HIERARCHIES()",
     "dependencies": "EVALUATE INFO.CALCDEPENDENCY()",
     "storage": "EVALUATE INFO.STORAGETABLES()",
+    
+    # Every METADATA_QUERIES section in one request, one result set per section
+    "full_metadata_batch": "\n".join(METADATA_QUERIES.values()),
 }
@@ -1,20 +1,88 @@
 import argparse
+import codecs
 import io
 import json
 import os
 import re
+import shutil
 import sys
+import threading
 import time
+import uuid
 import zipfile
 import subprocess
-from typing import Any, Dict, List, Optional, Tuple, Iterable, Set
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Iterable, Iterator, Set
 
 import requests
 from requests import Response
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from tqdm import tqdm
 
+try:
+    import orjson
+except ImportError:  # optional speed-up; the stdlib json module is used without it
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional: without it layouts are parsed whole
+    ijson = None
+
 
 API_ROOT = "https://api.powerbi.com/v1.0/myorg"
+# One keep-alive session for all Power BI calls so the TLS handshake is paid once.
+# 429s are left to pbi_request so its Retry-After backoff still applies.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=16,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504], raise_on_status=False),
+    ),
+)
+# Shared read-only default for `.get(...) or _EMPTY` chains; never mutate it
+_EMPTY: Dict[str, Any] = {}
+DOWNLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+# Exports larger than one part are fetched as parallel Range requests when the server allows it
+DOWNLOAD_PART_SIZE = 32 * 1024 * 1024
+DOWNLOAD_WORKERS = 4
+LAYOUT_READ_CHUNK_SIZE = 1024 * 1024
+# Bump when extract_bindings_from_layout output changes so stale .scan.json sidecars are rebuilt
+SCAN_CACHE_VERSION = 1
+# Below this many stale files a serial scan beats handing work to worker processes
+# (which are started by spawn on Windows)
+PARALLEL_SCAN_MIN_FILES = 8
+
+# Worker processes for scan_cached_pbix, started on first use and reused across calls
+_SCAN_POOL: Optional[ProcessPoolExecutor] = None
+_SCAN_POOL_LOCK = threading.Lock()
+
+
+def _json_loads(data: Any) -> Any:
+    """Parse JSON with orjson when installed, falling back to the stdlib.
+
+    orjson rejects a few things json accepts (NaN, integers over 64 bits), so
+    those inputs are retried with json.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON with orjson when installed; indent=True gives 2-space indentation."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode("utf-8")
 
 
 def get_az_token() -> str:
@@ -52,12 +120,13 @@ def pbi_request(
     params: Optional[Dict[str, Any]] = None,
     data: Optional[Any] = None,
     stream: bool = False,
+    headers: Optional[Dict[str, str]] = None,
     max_retries: int = 5,
 ) -> Response:
-    headers = {"Authorization": f"Bearer {token}"}
+    headers = {**(headers or {}), "Authorization": f"Bearer {token}"}
     backoff = 1.0
     for attempt in range(1, max_retries + 1):
-        resp = requests.request(method, url, headers=headers, params=params, data=data, stream=stream)
+        resp = _SESSION.request(method, url, headers=headers, params=params, data=data, stream=stream)
         if resp.status_code == 429:
             retry_after = int(resp.headers.get("Retry-After", 1))
             time.sleep(max(retry_after, backoff))
@@ -94,9 +163,49 @@ def list_pages(group_id: str, report_id: str, token: str) -> List[Dict[str, Any]
     return data.get("value", [])
 
 
+def _content_range_total(resp: Response) -> Optional[int]:
+    # "bytes 0-33554431/123456789"; the total may be "*" when the server does not know it
+    total = resp.headers.get("Content-Range", "").rpartition("/")[2]
+    return int(total) if total.isdigit() else None
+
+
+def _write_body(resp: Response, f, pbar: tqdm) -> None:
+    for chunk in resp.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+        if chunk:
+            f.write(chunk)
+            pbar.update(len(chunk))
+
+
+def _range_validator(resp: Response) -> Optional[str]:
+    """Return a validator usable in If-Range: a strong ETag, else Last-Modified."""
+    etag = resp.headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return resp.headers.get("Last-Modified")
+
+
+def _download_part(
+    url: str, token: str, out_pbix: str, start: int, end: int, validator: str, pbar: tqdm
+) -> None:
+    # If-Range makes the server send the whole (new) file instead of a part when the export changed
+    resp = pbi_request(
+        "GET", url, token, stream=True, headers={"Range": f"bytes={start}-{end}", "If-Range": validator}
+    )
+    with resp:
+        ensure_ok(resp, "Export PBIX")
+        if resp.status_code != 206 or not resp.headers.get("Content-Range", "").startswith(f"bytes {start}-"):
+            raise SystemExit("Export PBIX failed: the report export changed while its parts were downloading.")
+        # Each part writes through its own handle at its own offset (os.pwrite is not available on Windows)
+        with open(out_pbix, "r+b") as f:
+            f.seek(start)
+            _write_body(resp, f, pbar)
+
+
 def download_report_pbix(group_id: str, report_id: str, token: str, out_pbix: str) -> None:
     url = f"{API_ROOT}/groups/{group_id}/reports/{report_id}/Export"
-    resp = pbi_request("GET", url, token, stream=True)
+    # Ask for the first part only: a 206 reply with a validator means the rest can be fetched
+    # in parallel, a 200 reply is the whole file and is streamed as before
+    resp = pbi_request("GET", url, token, stream=True, headers={"Range": f"bytes=0-{DOWNLOAD_PART_SIZE - 1}"})
     if resp.status_code == 401:
         raise SystemExit("Export PBIX failed: 401 Unauthorized. Ensure your account has access.")
     if resp.status_code == 403:
@@ -105,125 +214,288 @@ def download_report_pbix(group_id: str, report_id: str, token: str, out_pbix: st
         )
     ensure_ok(resp, "Export PBIX")
 
-    total = int(resp.headers.get("Content-Length", 0))
-    with open(out_pbix, "wb") as f, tqdm(total=total, unit="B", unit_scale=True, desc="Downloading PBIX") as pbar:
-        for chunk in resp.iter_content(chunk_size=1024 * 1024):
-            if chunk:
-                f.write(chunk)
-                pbar.update(len(chunk))
+    size = validator = None
+    if resp.status_code == 206:
+        size = _content_range_total(resp)
+        validator = _range_validator(resp)
+        if size is None or validator is None:
+            # Without a known total and a validator the parts could come from different
+            # exports; start over as one serial stream
+            resp.close()
+            resp = pbi_request("GET", url, token, stream=True)
+            ensure_ok(resp, "Export PBIX")
+
+    if size is None or validator is None:
+        total = int(resp.headers.get("Content-Length", 0))
+        with resp, open(out_pbix, "wb") as f:
+            if not sys.stderr.isatty():
+                # No progress bar to drive (CI, redirected output): copy the body without a Python-level loop
+                resp.raw.decode_content = True
+                shutil.copyfileobj(resp.raw, f, length=DOWNLOAD_CHUNK_SIZE)
+                return
+            with tqdm(total=total, unit="B", unit_scale=True, desc="Downloading PBIX") as pbar:
+                _write_body(resp, f, pbar)
+        return
 
+    try:
+        with tqdm(
+            total=size, unit="B", unit_scale=True, desc="Downloading PBIX", disable=not sys.stderr.isatty()
+        ) as pbar:
+            with open(out_pbix, "wb") as f:
+                f.truncate(size)
+                with resp:
+                    _write_body(resp, f, pbar)
+            parts = [
+                (start, min(start + DOWNLOAD_PART_SIZE, size) - 1)
+                for start in range(DOWNLOAD_PART_SIZE, size, DOWNLOAD_PART_SIZE)
+            ]
+            if parts:
+                with ThreadPoolExecutor(max_workers=min(DOWNLOAD_WORKERS, len(parts))) as pool:
+                    futures = [
+                        pool.submit(_download_part, url, token, out_pbix, start, end, validator, pbar)
+                        for start, end in parts
+                    ]
+                    for future in futures:
+                        future.result()
+    except BaseException:
+        # Never leave a preallocated, partly written PBIX behind for the cache to pick up
+        try:
+            os.remove(out_pbix)
+        except OSError:
+            pass
+        raise
 
-def read_layout_from_pbix(pbix_path: str) -> Dict[str, Any]:
-    with zipfile.ZipFile(pbix_path, "r") as zf:
+
+def _sniff_layout_encoding(head: bytes) -> Optional[str]:
+    """Pick the Report/Layout codec from its first three bytes; None means plain UTF-8."""
+    if head[:2] in (b"\xff\xfe", b"\xfe\xff"):
+        return "utf-16"  # the BOM gives the byte order
+    if len(head) >= 2 and head[1] == 0:
+        # Power BI Desktop writes UTF-16-LE without a BOM: '{' followed by NUL
+        return "utf-16-le"
+    if len(head) >= 2 and head[0] == 0:
+        return "utf-16-be"
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    return None
+
+
+class PbixReader:
+    """An open PBIX archive for callers that read the layout more than once.
+
+    The zip central directory is parsed once when the reader is created; use it as a
+    context manager so the file handle is released (Windows locks open files).
+    """
+
+    def __init__(self, pbix_path: str):
+        self.pbix_path = pbix_path
+        self._zf = zipfile.ZipFile(pbix_path, "r")
+
+    def __enter__(self) -> "PbixReader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._zf.close()
+
+    def _open_layout(self):
         try:
-            with zf.open("Report/Layout") as layout_file:
-                raw = layout_file.read()
-                try:
-                    text = raw.decode("utf-8")
-                except UnicodeDecodeError:
-                    # Some PBIX store with utf-16
-                    text = raw.decode("utf-16")
-                return json.loads(text)
+            return self._zf.open("Report/Layout")
         except KeyError as exc:
             raise SystemExit("PBIX parsing failed: 'Report/Layout' not found in the PBIX.") from exc
 
+    def read_layout(self) -> Dict[str, Any]:
+        with self._open_layout() as layout_file:
+            raw = layout_file.read()
+        encoding = _sniff_layout_encoding(raw[:3])
+        if encoding is None and orjson is not None:
+            try:
+                # UTF-8 layouts are parsed straight from the bytes, without a decoded copy
+                return orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                pass  # JSON only the stdlib accepts
+        return _json_loads(raw.decode(encoding or "utf-8"))
+
+    def iter_layout_sections(self) -> Iterator[Dict[str, Any]]:
+        """Yield the Report/Layout sections one at a time, parsed incrementally with ijson.
+
+        The layout is decompressed and parsed in chunks, so only one section's tree is held
+        at a time instead of the raw bytes plus the whole document (resourcePackages, report config).
+        """
+        with self._open_layout() as layout_file:
+            encoding = _sniff_layout_encoding(layout_file.peek(3)[:3])
+            # ijson (yajl) only reads UTF-8, so other encodings are transcoded chunk by chunk
+            decoder = codecs.getincrementaldecoder(encoding)() if encoding else None
+            sections = ijson.sendable_list()
+            parser = ijson.items_coro(sections, "sections.item", use_float=True)
+            while True:
+                chunk = layout_file.read(LAYOUT_READ_CHUNK_SIZE)
+                if decoder is not None:
+                    chunk = decoder.decode(chunk, final=not chunk).encode("utf-8")
+                if not chunk:
+                    break
+                parser.send(chunk)
+                yield from sections
+                del sections[:]
+            parser.close()
+            yield from sections
+
+    def iter_pages(self) -> Iterator[Dict[str, Any]]:
+        """Yield page bindings as they are extracted, streaming the layout when ijson is installed."""
+        if ijson is None:
+            return iter_pages(self.read_layout())
+        return _iter_section_pages(self.iter_layout_sections())
+
+    def read_bindings(self) -> List[Dict[str, Any]]:
+        """Extract the page/visual bindings, streaming the layout when ijson is installed."""
+        return list(self.iter_pages())
+
+
+def read_layout_from_pbix(pbix_path: str) -> Dict[str, Any]:
+    with PbixReader(pbix_path) as reader:
+        return reader.read_layout()
+
+
+def read_bindings_from_pbix(pbix_path: str) -> List[Dict[str, Any]]:
+    """Extract the page/visual bindings of a PBIX (read_layout_from_pbix + extract_bindings_from_layout).
+
+    With ijson installed the layout is streamed section by section, which keeps peak memory
+    to roughly one page rather than the whole layout document.
+    """
+    with PbixReader(pbix_path) as reader:
+        return reader.read_bindings()
+
 
 def _load_visual_config(vc: Dict[str, Any]) -> Dict[str, Any]:
     cfg = vc.get("config")
     if isinstance(cfg, str):
         try:
-            return json.loads(cfg)
+            return _json_loads(cfg)
         except Exception:
             return {}
     return cfg or {}
 
 
 def _extract_title(single_visual: Dict[str, Any]) -> Optional[str]:
-    objects = single_visual.get("objects", {}) or {}
-    title_arr = objects.get("title") or []
-    if not isinstance(title_arr, list) or not title_arr:
+    title_arr = (single_visual.get("objects") or _EMPTY).get("title")
+    # Most visuals have no title object; leave before walking the chain
+    if not title_arr or not isinstance(title_arr, list):
         return None
-    props = (title_arr[0] or {}).get("properties", {})
-    text = props.get("text") or {}
+    props = (title_arr[0] or _EMPTY).get("properties") or _EMPTY
     # Common shape: { 'expr': { 'Literal': { 'Value': "'Revenue by Month'" } } }
-    expr = text.get("expr") or {}
-    lit = expr.get("Literal") or {}
-    val = lit.get("Value")
+    expr = (props.get("text") or _EMPTY).get("expr") or _EMPTY
+    val = (expr.get("Literal") or _EMPTY).get("Value")
     if isinstance(val, str):
         return val.strip("'\"")
     return None
 
 
+def _fq_from_node(node: Dict[str, Any]) -> Optional[str]:
+    g = node.get
+    measure = g("Measure")
+    column = g("Column")
+    if not isinstance(measure, str) and not isinstance(column, str):
+        return None
+    src = g("SourceRef") or (g("Expression") or _EMPTY).get("SourceRef")
+    entity = src.get("Entity") if isinstance(src, dict) else None
+    if not entity:
+        return None
+    # Measure wins over Column when both are present
+    if isinstance(measure, str) and measure:
+        return f"{entity}[{measure}]"
+    if isinstance(column, str) and column:
+        return f"{entity}[{column}]"
+    return None
+
+
 def _scan_selects_for_refs(selects: List[Dict[str, Any]]) -> Dict[str, str]:
     """Map queryRef/Name -> fully qualified Table[FieldOrMeasure]."""
     mapping: Dict[str, str] = {}
-
-    def fq_from_node(node: Dict[str, Any]) -> Optional[str]:
-        # Measure
-        if isinstance(node.get("Measure"), str):
-            entity = None
-            src = node.get("SourceRef") or node.get("Expression", {}).get("SourceRef")
-            if isinstance(src, dict):
-                entity = src.get("Entity")
-            measure = node.get("Measure")
-            if entity and measure:
-                return f"{entity}[{measure}]"
-
-        # Column
-        if isinstance(node.get("Column"), str):
-            entity = None
-            src = node.get("SourceRef") or node.get("Expression", {}).get("SourceRef")
-            if isinstance(src, dict):
-                entity = src.get("Entity")
-            column = node.get("Column")
-            if entity and column:
-                return f"{entity}[{column}]"
-        return None
-
     for sel in selects or []:
         name = sel.get("Name") or sel.get("QueryRef") or sel.get("queryRef")
         if not name:
             continue
         for key in ("Expression", "Measure", "Column", "SourceRef"):
             if key in sel and isinstance(sel[key], dict):
-                fq = fq_from_node(sel[key])
+                fq = _fq_from_node(sel[key])
                 if fq:
                     mapping[name] = fq
                     break
         # Nested under Expression
         expr = sel.get("Expression")
         if isinstance(expr, dict):
-            fq = fq_from_node(expr)
+            fq = _fq_from_node(expr)
             if fq:
                 mapping[name] = fq
                 continue
     return mapping
 
 
+_PREVIEW_ENCODER = json.JSONEncoder()
+
+
+def _node_preview(node: Dict[str, Any], limit: int = 200) -> str:
+    """Return json.dumps(node)[:limit], encoding only as much of the node as the preview needs."""
+    parts: List[str] = []
+    size = 0
+    for chunk in _PREVIEW_ENCODER.iterencode(node):
+        parts.append(chunk)
+        size += len(chunk)
+        if size >= limit:
+            break
+    return "".join(parts)[:limit]
+
+
 def _collect_from_node(node: Any, refs: Set[str], unresolved: Set[str]) -> None:
-    if isinstance(node, dict):
-        # direct measure/column refs
-        if ("Measure" in node or "Column" in node) and ("SourceRef" in node or "Expression" in node or "Entity" in node):
-            entity = None
-            src = node.get("SourceRef") or node.get("Expression", {}).get("SourceRef")
-            if isinstance(src, dict):
-                entity = src.get("Entity") or src.get("Source")
-            target = node.get("Measure") or node.get("Column")
-            if isinstance(entity, str) and isinstance(target, str):
-                refs.add(f"{entity}[{target}]")
-            else:
-                unresolved.add(json.dumps(node)[:200])
-        # Recurse
-        for v in node.values():
-            _collect_from_node(v, refs, unresolved)
-    elif isinstance(node, list):
-        for v in node:
-            _collect_from_node(v, refs, unresolved)
+    # Explicit stack rather than recursion: deep layouts stay clear of the recursion limit
+    add_ref = refs.add
+    add_unresolved = unresolved.add
+    stack = [node]
+    pop = stack.pop
+    push = stack.extend
+    while stack:
+        cur = pop()
+        if isinstance(cur, dict):
+            # direct measure/column refs
+            if ("Measure" in cur or "Column" in cur) and ("SourceRef" in cur or "Expression" in cur or "Entity" in cur):
+                g = cur.get
+                entity = None
+                src = g("SourceRef") or (g("Expression") or _EMPTY).get("SourceRef")
+                if isinstance(src, dict):
+                    entity = src.get("Entity") or src.get("Source")
+                target = g("Measure") or g("Column")
+                if isinstance(entity, str) and isinstance(target, str):
+                    add_ref(f"{entity}[{target}]")
+                else:
+                    add_unresolved(_node_preview(cur))
+            push(cur.values())
+        elif isinstance(cur, list):
+            push(cur)
+
+
+def _dedupe_list(items: Iterable[str]) -> List[str]:
+    """Drop empty and repeated items, keeping first-seen order."""
+    seen: Set[str] = set()
+    out: List[str] = []
+    for x in items:
+        if x and x not in seen:
+            seen.add(x)
+            out.append(x)
+    return out
 
 
 def extract_bindings_from_layout(layout: Dict[str, Any]) -> List[Dict[str, Any]]:
-    pages_out: List[Dict[str, Any]] = []
-    sections = layout.get("sections") or []
+    return list(iter_pages(layout))
+
+
+def iter_pages(layout: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Yield the bindings of one page at a time (the lazy form of extract_bindings_from_layout)."""
+    return _iter_section_pages(layout.get("sections") or [])
+
+
+def _iter_section_pages(sections: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
     for sec in sections:
         page_obj: Dict[str, Any] = {
             "pageName": sec.get("name"),
@@ -245,7 +517,7 @@ def extract_bindings_from_layout(layout: Dict[str, Any]) -> List[Dict[str, Any]]
             if title:
                 visual["visualTitle"] = title
 
-            measures: List[Dict[str, Any]] = []
+            measure_names: List[str] = []
             fields: List[str] = []
             unresolved: Set[str] = set()
 
@@ -263,41 +535,41 @@ def extract_bindings_from_layout(layout: Dict[str, Any]) -> List[Dict[str, Any]]
                         if fq:
                             # Heuristic: if appears to be a measure (capitalization not guaranteed)
                             if "]" in fq and any(token in fq.lower() for token in ("total", "sum", "measure")):
-                                measures.append({"fullyQualifiedName": fq})
+                                measure_names.append(fq)
                             else:
                                 fields.append(fq)
                         else:
                             unresolved.add(ref)
 
-            # Also scan other parts for direct refs
+            # Also scan other parts for direct refs; only the unresolved ones are reported
+            direct_refs: Set[str] = set()
             for key in ("prototypeQuery", "dataTransforms", "drillFilter", "filters"):
-                _collect_from_node(single.get(key), set(fields), unresolved)
-
-            # Deduplicate while preserving order
-            def dedupe_list(items: Iterable[str]) -> List[str]:
-                seen: Set[str] = set()
-                out: List[str] = []
-                for x in items:
-                    if x and x not in seen:
-                        seen.add(x)
-                        out.append(x)
-                return out
-
-            fields = dedupe_list(fields)
+                _collect_from_node(single.get(key), direct_refs, unresolved)
+
             # Ensure measures not duplicated and not also in fields
-            measure_names = dedupe_list([m.get("fullyQualifiedName") for m in measures if m.get("fullyQualifiedName")])
-            fields = [f for f in fields if f not in set(measure_names)]
-            measures = [{"fullyQualifiedName": m} for m in measure_names]
+            measure_names = _dedupe_list(measure_names)
+            measure_set = set(measure_names)
+            fields = [f for f in _dedupe_list(fields) if f not in measure_set]
 
-            visual["measures"] = measures
+            visual["measures"] = [{"fullyQualifiedName": m} for m in measure_names]
             visual["fields"] = fields
             if unresolved:
                 visual["unresolvedBindings"] = sorted(unresolved)
             visuals_out.append(visual)
 
         page_obj["visuals"] = visuals_out
-        pages_out.append(page_obj)
-    return pages_out
+        yield page_obj
+
+
+# Measures and columns in one XMLA round trip. DMV SQL has no JOIN or UNION, so this is DAX:
+# INFO.VIEW.* already resolve the table name, which drops the separate TMSCHEMA_TABLES query.
+DMV_BINDINGS_QUERY = """
+EVALUATE
+UNION(
+    SELECTCOLUMNS(INFO.VIEW.MEASURES(), "Kind", "M", "Table", [Table], "Name", [Name], "Expression", [Expression]),
+    SELECTCOLUMNS(INFO.VIEW.COLUMNS(), "Kind", "C", "Table", [Table], "Name", [Name], "Expression", [Expression])
+)"""
+DMV_FETCH_SIZE = 1000
 
 
 def read_dmvs(workspace: str, dataset_name: str, token: str) -> Dict[str, Dict[str, Any]]:
@@ -316,48 +588,45 @@ def read_dmvs(workspace: str, dataset_name: str, token: str) -> Dict[str, Dict[s
         conn = Pyadomd(conn_str, azure_token=token)  # type: ignore
 
     with conn:
-        def query(sql: str) -> List[Dict[str, Any]]:
+        def query(sql: str) -> Iterator[Tuple[Any, ...]]:
             with conn.cursor().execute(sql) as cur:
-                cols = [c[0] for c in cur.description]
-                return [dict(zip(cols, row)) for row in cur.fetchall()]
-
-        tables = query("SELECT * FROM $SYSTEM.TMSCHEMA_TABLES")
-        tbl_by_id = {t.get("ID"): t.get("Name") for t in tables}
+                # DAX results name columns "[Kind]"; DMV results use bare names
+                Row = namedtuple("Row", [c[0].strip("[]") for c in cur.description], rename=True)
+                # Fetch in batches so rows are consumed as they arrive, not held as one list of dicts
+                while True:
+                    rows = cur.fetchmany(DMV_FETCH_SIZE)
+                    if not rows:
+                        break
+                    yield from map(Row._make, rows)
 
-        measures = query("SELECT * FROM $SYSTEM.TMSCHEMA_MEASURES")
         meas_map: Dict[str, Dict[str, Any]] = {}
-        for m in measures:
-            table_name = tbl_by_id.get(m.get("TableID"))
-            name = m.get("Name")
-            expr = m.get("Expression")
-            if table_name and name:
-                fq = f"{table_name}[{name}]"
-                meas_map[fq] = {"dax": expr}
-
         # Columns not strictly needed for dax, but can be returned for future enrichment
-        columns = query("SELECT * FROM $SYSTEM.TMSCHEMA_COLUMNS")
         col_map: Dict[str, Dict[str, Any]] = {}
-        for c in columns:
-            table_name = tbl_by_id.get(c.get("TableID"))
-            name = c.get("Name")
-            if table_name and name:
-                fq = f"{table_name}[{name}]"
+        for row in query(DMV_BINDINGS_QUERY):
+            table_name = row.Table
+            name = row.Name
+            if not (table_name and name):
+                continue
+            fq = f"{table_name}[{name}]"
+            if row.Kind == "M":
+                meas_map[fq] = {"dax": row.Expression}
+            else:
                 col_map[fq] = {}
 
     return {"measures": meas_map, "columns": col_map}
 
 
 def attach_dax_to_measures(structure: List[Dict[str, Any]], dmvs: Dict[str, Dict[str, Any]]) -> None:
-    m = dmvs.get("measures", {})
+    m_get = dmvs.get("measures", _EMPTY).get
     for page in structure:
-        for vis in page.get("visuals", []):
-            for meas in vis.get("measures", []):
-                fq = meas.get("fullyQualifiedName")
-                if fq in m and dmvs["measures"][fq].get("dax"):
-                    meas["dax"] = dmvs["measures"][fq]["dax"]
+        for vis in page.get("visuals", ()):
+            for meas in vis.get("measures", ()):
+                dax = m_get(meas.get("fullyQualifiedName"), _EMPTY).get("dax")
+                if dax:
+                    meas["dax"] = dax
 
 
-def _flatten_bindings(structure: List[Dict[str, Any]]) -> Set[str]:
+def _flatten_bindings(structure: Iterable[Dict[str, Any]]) -> Set[str]:
     """Create a report signature: set of fully-qualified bindings (measures + fields)."""
     sig: Set[str] = set()
     for page in structure:
@@ -372,28 +641,137 @@ def _flatten_bindings(structure: List[Dict[str, Any]]) -> Set[str]:
     return sig
 
 
-def scan_cached_pbix(cache_dir: str) -> List[Dict[str, Any]]:
-    """Scan a cache directory for .pbix files and extract layout bindings."""
-    results: List[Dict[str, Any]] = []
-    p = Path(cache_dir)
-    for pbix_path in p.glob("*.pbix"):
+def _scan_key(pbix_path: str) -> Dict[str, int]:
+    st = os.stat(pbix_path)
+    return {"version": SCAN_CACHE_VERSION, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _read_scan_sidecar(pbix_path: str) -> Optional[List[Dict[str, Any]]]:
+    """Return the bindings memoized in a PBIX's .scan.json sidecar, or None when it is missing or stale.
+
+    The sidecar is keyed on the PBIX size and mtime, so a re-downloaded file is parsed again.
+    """
+    try:
+        key = _scan_key(pbix_path)
+        with open(pbix_path + ".scan.json", "rb") as f:
+            cached = _json_loads(f.read())
+        if cached.get("key") == key:
+            return cached["structure"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass  # missing or unreadable sidecar: rebuild it
+    return None
+
+
+def _build_scan(pbix_path: str) -> List[Dict[str, Any]]:
+    """Extract the bindings for a PBIX and memoize them in its .scan.json sidecar."""
+    key = _scan_key(pbix_path)
+    structure = read_bindings_from_pbix(pbix_path)
+    sidecar = pbix_path + ".scan.json"
+    # Unique per writer, so threads scanning the same PBIX cannot publish a torn sidecar
+    tmp_path = f"{sidecar}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(_json_dumps({"key": key, "structure": structure}))
+        os.replace(tmp_path, sidecar)
+    except OSError:
+        # A read-only cache still works, it just is not memoized
         try:
-            layout = read_layout_from_pbix(str(pbix_path))
-            structure = extract_bindings_from_layout(layout)
-            signature = _flatten_bindings(structure)
-            visuals_count = sum(len(pg.get("visuals", [])) for pg in structure)
-            results.append({
-                "report_id": pbix_path.stem,
-                "pbix_path": str(pbix_path),
-                "pages": len(structure),
-                "visuals": visuals_count,
-                "unique_bindings": len(signature),
-                "structure": structure,
-            })
+            os.remove(tmp_path)
+        except OSError:
+            pass
+    return structure
+
+
+def _scan_summary(pbix_path: str, structure: List[Dict[str, Any]]) -> Dict[str, Any]:
+    signature = _flatten_bindings(structure)
+    visuals_count = sum(len(pg.get("visuals", [])) for pg in structure)
+    return {
+        "report_id": Path(pbix_path).stem,
+        "pbix_path": pbix_path,
+        "pages": len(structure),
+        "visuals": visuals_count,
+        "unique_bindings": len(signature),
+        "structure": structure,
+    }
+
+
+def _scan_one(pbix_path: str) -> Dict[str, Any]:
+    """Parse one PBIX whose sidecar is stale (module level so worker processes can run it)."""
+    return _scan_summary(pbix_path, _build_scan(pbix_path))
+
+
+def _scan_pool() -> ProcessPoolExecutor:
+    global _SCAN_POOL
+    with _SCAN_POOL_LOCK:
+        if _SCAN_POOL is None:
+            _SCAN_POOL = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+        return _SCAN_POOL
+
+
+def _discard_scan_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken shared pool so the next parallel scan starts a fresh one."""
+    global _SCAN_POOL
+    with _SCAN_POOL_LOCK:
+        if _SCAN_POOL is pool:
+            _SCAN_POOL = None
+    pool.shutdown(wait=False)
+
+
+def _try_scan_one(pbix_path: str) -> Optional[Dict[str, Any]]:
+    try:
+        return _scan_one(pbix_path)
+    except Exception:
+        # Skip unreadable PBIX files
+        return None
+
+
+def _scan_stale(pbix_paths: List[str]) -> List[Optional[Dict[str, Any]]]:
+    """Parse PBIX files without a current sidecar, None for each unreadable one."""
+    if len(pbix_paths) < PARALLEL_SCAN_MIN_FILES:
+        return [_try_scan_one(pbix_path) for pbix_path in pbix_paths]
+
+    pool = _scan_pool()
+    try:
+        futures = [pool.submit(_scan_one, pbix_path) for pbix_path in pbix_paths]
+    except BrokenProcessPool:
+        # The shared pool broke after an earlier call; scan this batch serially
+        _discard_scan_pool(pool)
+        return [_try_scan_one(pbix_path) for pbix_path in pbix_paths]
+    scans: List[Optional[Dict[str, Any]]] = []
+    for pbix_path, future in zip(pbix_paths, futures):
+        try:
+            scans.append(future.result())
+        except BrokenProcessPool:
+            # A worker died; finish this call serially and start a fresh pool next time
+            _discard_scan_pool(pool)
+            scans.append(_try_scan_one(pbix_path))
         except Exception:
             # Skip unreadable PBIX files
-            continue
-    return results
+            scans.append(None)
+    return scans
+
+
+def scan_cached_pbix(cache_dir: str) -> List[Dict[str, Any]]:
+    """Scan a cache directory for .pbix files and extract layout bindings.
+
+    Current .scan.json sidecars are read here; only stale files are parsed, in a shared
+    pool of worker processes when there are enough of them. Results keep directory order.
+    """
+    pbix_paths = [str(pbix_path) for pbix_path in Path(cache_dir).glob("*.pbix")]
+    scans: List[Optional[Dict[str, Any]]] = []
+    stale: List[int] = []
+    for index, pbix_path in enumerate(pbix_paths):
+        structure = _read_scan_sidecar(pbix_path)
+        if structure is None:
+            stale.append(index)
+            scans.append(None)
+        else:
+            scans.append(_scan_summary(pbix_path, structure))
+
+    if stale:
+        for index, scan in zip(stale, _scan_stale([pbix_paths[i] for i in stale])):
+            scans[index] = scan
+    return [scan for scan in scans if scan is not None]
 
 
 def find_similar_reports(cache_dir: str, target_report_id: str, top_k: int = 5) -> List[Dict[str, Any]]:
@@ -404,13 +782,16 @@ def find_similar_reports(cache_dir: str, target_report_id: str, top_k: int = 5)
     if not target:
         return []
     target_sig = _flatten_bindings(target.get("structure", []))
+    if not target_sig:
+        # Nothing to compare against; skip flattening every other report
+        return []
 
     sims: List[Tuple[str, float, int, int]] = []
     for rid, info in by_id.items():
         if rid == target_report_id:
             continue
         sig = _flatten_bindings(info.get("structure", []))
-        if not sig or not target_sig:
+        if not sig:
             continue
         inter = len(target_sig & sig)
         union = len(target_sig | sig)
@@ -457,8 +838,7 @@ def main() -> None:
     download_report_pbix(args.group_id, args.report_id, token, args.out_pbix)
 
     # Parse layout and extract bindings
-    layout = read_layout_from_pbix(args.out_pbix)
-    structure = extract_bindings_from_layout(layout)
+    structure = read_bindings_from_pbix(args.out_pbix)
 
     # Optional XMLA enrichment
     if args.workspace and args.dataset_name:
@@ -473,8 +853,8 @@ def main() -> None:
             )
 
     # Write output
-    with open(args.out_json, "w", encoding="utf-8") as f:
-        json.dump(structure, f, indent=2)
+    with open(args.out_json, "wb") as f:
+        f.write(_json_dumps(structure, indent=True))
     print(f"Wrote structure to {args.out_json}")
 
 
@@ -1,5 +1,6 @@
 import subprocess
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
@@ -39,9 +40,10 @@ class TmdlClient:
             raise RuntimeError(proc.stderr or proc.stdout or f"Download failed with exit code {proc.returncode}")
         return proc.stdout.strip()
 
-    def export_workspace_models(self, workspace_id: str, out_root: str) -> dict:
+    def export_workspace_models(self, workspace_id: str, out_root: str, max_workers: int = 8) -> dict:
         """Export all semantic models in a workspace to TMDL folders under out_root.
 
+        Up to max_workers TmdlTools.exe downloads run at once; items keep the model listing order.
         Returns a summary with successes and failures like V4's TMDL_Definitions population.
         """
         from core.fabric_client import FabricClient  # local import to avoid cycles
@@ -54,17 +56,26 @@ class TmdlClient:
 
         summary: dict = {"workspace_id": workspace_id, "total": len(models), "exported": 0, "failed": 0, "items": []}
 
-        for m in models:
-            safe_name = "".join(c for c in m.name if c.isalnum() or c in (" ", "-", "_")).strip()
-            model_dir = out_root_path / f"{safe_name}_{m.id}"
-            model_dir.mkdir(parents=True, exist_ok=True)
-            try:
-                dest = self.download_tmdl(workspace_id, m.id, str(model_dir / "definition"))
-                summary["items"].append({"id": m.id, "name": m.name, "path": str(dest)})
-                summary["exported"] += 1
-            except Exception as e:
-                summary["items"].append({"id": m.id, "name": m.name, "error": str(e)})
-                summary["failed"] += 1
+        if not models:
+            return summary
+
+        # Each download is a separate exe process, so threads overlap its startup and network time
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(models)))) as ex:
+            futures = []
+            for m in models:
+                safe_name = "".join(c for c in m.name if c.isalnum() or c in (" ", "-", "_")).strip()
+                model_dir = out_root_path / f"{safe_name}_{m.id}"
+                model_dir.mkdir(parents=True, exist_ok=True)
+                futures.append((m, ex.submit(self.download_tmdl, workspace_id, m.id, str(model_dir / "definition"))))
+
+            for m, future in futures:
+                try:
+                    dest = future.result()
+                    summary["items"].append({"id": m.id, "name": m.name, "path": str(dest)})
+                    summary["exported"] += 1
+                except Exception as e:
+                    summary["items"].append({"id": m.id, "name": m.name, "error": str(e)})
+                    summary["failed"] += 1
 
         return summary
 
@@ -9,17 +9,51 @@ using Microsoft.AnalysisServices.AdomdClient;
 public static class DaxQueryExecutor
 {
     /// <summary>
-    /// Execute a DAX query and return results as JSON.
+    /// Connections kept open across serve requests, keyed by connection string.
+    /// </summary>
+    private static readonly Dictionary<string, AdomdConnection> PooledConnections = new();
+
+    /// <summary>
+    /// Execute a DAX query and return results as compact JSON:
+    /// {"columns": [names], "data": [[row values], ...], "rowCount": n}.
+    /// A query with several EVALUATE statements instead returns {"resultSets": [...]},
+    /// one such object per statement.
     /// </summary>
     public static string ExecuteQueryAsJson(string connectionString, string daxQuery)
     {
         using var connection = new AdomdConnection(connectionString);
         connection.Open();
+        return ExecuteQueryAsJson(connection, daxQuery);
+    }
 
+    /// <summary>
+    /// Execute a DAX query on an already open connection and return results as JSON.
+    /// </summary>
+    public static string ExecuteQueryAsJson(AdomdConnection connection, string daxQuery)
+    {
         using var command = new AdomdCommand(daxQuery, connection);
         using var reader = command.ExecuteReader();
 
-        var results = new List<Dictionary<string, object?>>();
+        var resultSets = new List<Dictionary<string, object>>();
+        do
+        {
+            resultSets.Add(ReadResultSet(reader));
+        } while (reader.NextResult());
+
+        if (resultSets.Count > 1)
+        {
+            return JsonSerializer.Serialize(new Dictionary<string, object> { ["resultSets"] = resultSets });
+        }
+        return JsonSerializer.Serialize(resultSets[0]);
+    }
+
+    /// <summary>
+    /// Read the current result set of a reader into columns/data/rowCount.
+    /// Rows are value arrays in column order, so column names are not repeated per row.
+    /// </summary>
+    private static Dictionary<string, object> ReadResultSet(AdomdDataReader reader)
+    {
+        var data = new List<object?[]>();
         var columns = new List<string>();
 
         // Get column names
@@ -31,21 +65,21 @@ public static class DaxQueryExecutor
         // Read all rows
         while (reader.Read())
         {
-            var row = new Dictionary<string, object?>();
+            var row = new object?[reader.FieldCount];
             for (int i = 0; i < reader.FieldCount; i++)
             {
                 var value = reader.GetValue(i);
-                row[columns[i]] = value == DBNull.Value ? null : value;
+                row[i] = value == DBNull.Value ? null : value;
             }
-            results.Add(row);
+            data.Add(row);
         }
 
-        return JsonSerializer.Serialize(new
+        return new Dictionary<string, object>
         {
-            columns,
-            rows = results,
-            rowCount = results.Count
-        }, new JsonSerializerOptions { WriteIndented = true });
+            ["columns"] = columns,
+            ["data"] = data,
+            ["rowCount"] = data.Count
+        };
     }
 
     /// <summary>
@@ -53,6 +87,16 @@ public static class DaxQueryExecutor
     /// Uses the same DAX query pattern Ryan provided.
     /// </summary>
     public static string GetDaxDocumentation(string connectionString)
+    {
+        using var connection = new AdomdConnection(connectionString);
+        connection.Open();
+        return GetDaxDocumentation(connection);
+    }
+
+    /// <summary>
+    /// Get all DAX documentation on an already open connection.
+    /// </summary>
+    public static string GetDaxDocumentation(AdomdConnection connection)
     {
         var query = @"
             VAR __measures =
@@ -91,13 +135,23 @@ public static class DaxQueryExecutor
             RETURN
                 UNION ( __measures, __columns, __tables )";
 
-        return ExecuteQueryAsJson(connectionString, "EVALUATE " + query);
+        return ExecuteQueryAsJson(connection, "EVALUATE " + query);
     }
 
     /// <summary>
     /// Get full model metadata including relationships, hierarchies, etc.
     /// </summary>
     public static string GetFullModelMetadata(string connectionString)
+    {
+        using var connection = new AdomdConnection(connectionString);
+        connection.Open();
+        return GetFullModelMetadata(connection);
+    }
+
+    /// <summary>
+    /// Get full model metadata on an already open connection.
+    /// </summary>
+    public static string GetFullModelMetadata(AdomdConnection connection)
     {
         var metadata = new Dictionary<string, object>();
 
@@ -113,7 +167,7 @@ public static class DaxQueryExecutor
                 ""Expression"", [Expression],
                 ""DataCategory"", [Data Category]
             )";
-        metadata["tables"] = JsonSerializer.Deserialize<object>(ExecuteQueryAsJson(connectionString, tablesQuery));
+        metadata["tables"] = JsonSerializer.Deserialize<object>(ExecuteQueryAsJson(connection, tablesQuery));
 
         // Columns
         var columnsQuery = @"
@@ -131,7 +185,7 @@ public static class DaxQueryExecutor
                 ""IsKey"", [Is Key],
                 ""SummarizeBy"", [Summarize By]
             )";
-        metadata["columns"] = JsonSerializer.Deserialize<object>(ExecuteQueryAsJson(connectionString, columnsQuery));
+        metadata["columns"] = JsonSerializer.Deserialize<object>(ExecuteQueryAsJson(connection, columnsQuery));
 
         // Measures
         var measuresQuery = @"
@@ -146,7 +200,7 @@ public static class DaxQueryExecutor
                 ""IsHidden"", [Is Hidden],
                 ""DisplayFolder"", [Display Folder]
             )";
-        metadata["measures"] = JsonSerializer.Deserialize<object>(ExecuteQueryAsJson(connectionString, measuresQuery));
+        metadata["measures"] = JsonSerializer.Deserialize<object>(ExecuteQueryAsJson(connection, measuresQuery));
 
         // Relationships
         var relationshipsQuery = @"
@@ -162,7 +216,7 @@ public static class DaxQueryExecutor
                 ""Cardinality"", [Cardinality],
                 ""SecurityFilterDirection"", [Security Filter Direction]
             )";
-        metadata["relationships"] = JsonSerializer.Deserialize<object>(ExecuteQueryAsJson(connectionString, relationshipsQuery));
+        metadata["relationships"] = JsonSerializer.Deserialize<object>(ExecuteQueryAsJson(connection, relationshipsQuery));
 
         // Hierarchies
         var hierarchiesQuery = @"
@@ -174,7 +228,7 @@ public static class DaxQueryExecutor
                 ""Description"", [Description],
                 ""IsHidden"", [Is Hidden]
             )";
-        metadata["hierarchies"] = JsonSerializer.Deserialize<object>(ExecuteQueryAsJson(connectionString, hierarchiesQuery));
+        metadata["hierarchies"] = JsonSerializer.Deserialize<object>(ExecuteQueryAsJson(connection, hierarchiesQuery));
 
         // Calculation dependencies (for measure dependency analysis)
         var dependenciesQuery = @"
@@ -182,7 +236,7 @@ public static class DaxQueryExecutor
             INFO.CALCDEPENDENCY()";
         try
         {
-            metadata["dependencies"] = JsonSerializer.Deserialize<object>(ExecuteQueryAsJson(connectionString, dependenciesQuery));
+            metadata["dependencies"] = JsonSerializer.Deserialize<object>(ExecuteQueryAsJson(connection, dependenciesQuery));
         }
         catch
         {
@@ -190,7 +244,104 @@ public static class DaxQueryExecutor
             metadata["dependencies"] = null;
         }
 
-        return JsonSerializer.Serialize(metadata, new JsonSerializerOptions { WriteIndented = true });
+        return JsonSerializer.Serialize(metadata);
+    }
+
+    /// <summary>
+    /// Get DAX documentation and full model metadata over a single connection.
+    /// Returns {"dax_docs": ..., "metadata": ...}.
+    /// </summary>
+    public static string GetDaxDocsAndMetadata(string connectionString)
+    {
+        using var connection = new AdomdConnection(connectionString);
+        connection.Open();
+        return GetDaxDocsAndMetadata(connection);
+    }
+
+    /// <summary>
+    /// Get DAX documentation and full model metadata on an already open connection.
+    /// </summary>
+    public static string GetDaxDocsAndMetadata(AdomdConnection connection)
+    {
+        using var daxDocs = JsonDocument.Parse(GetDaxDocumentation(connection));
+        using var metadata = JsonDocument.Parse(GetFullModelMetadata(connection));
+        return JsonSerializer.Serialize(new
+        {
+            dax_docs = daxDocs.RootElement,
+            metadata = metadata.RootElement
+        });
+    }
+
+    /// <summary>
+    /// Return the pooled open connection for a connection string, opening one if needed.
+    /// </summary>
+    private static AdomdConnection GetPooledConnection(string connectionString)
+    {
+        if (PooledConnections.TryGetValue(connectionString, out var connection))
+        {
+            if (connection.State == ConnectionState.Open) return connection;
+            connection.Dispose();
+        }
+
+        connection = new AdomdConnection(connectionString);
+        connection.Open();
+        PooledConnections[connectionString] = connection;
+        return connection;
+    }
+
+    /// <summary>
+    /// Close and forget the pooled connection for a connection string.
+    /// </summary>
+    private static void DropPooledConnection(string connectionString)
+    {
+        if (PooledConnections.Remove(connectionString, out var connection))
+        {
+            connection.Dispose();
+        }
+    }
+
+    /// <summary>
+    /// Handle one "serve" request: {"id", "method", "params"} on a single line.
+    /// Returns a single-line response with the same id and either "result" or "error".
+    /// Requests reuse one pooled connection, which is reopened once if it was lost.
+    /// </summary>
+    public static string HandleRequest(string connectionString, string requestLine)
+    {
+        JsonElement? id = null;
+        try
+        {
+            using var request = JsonDocument.Parse(requestLine);
+            var root = request.RootElement;
+            id = root.GetProperty("id").Clone();
+
+            var method = root.GetProperty("method").GetString();
+            Func<AdomdConnection, string> run = method switch
+            {
+                "query" => connection => ExecuteQueryAsJson(connection, root.GetProperty("params").GetProperty("dax").GetString()!),
+                "get-dax-docs" => GetDaxDocumentation,
+                "get-model-metadata" => GetFullModelMetadata,
+                "combined" => GetDaxDocsAndMetadata,
+                _ => throw new ArgumentException($"Unknown method: {method}")
+            };
+
+            string result;
+            try
+            {
+                result = run(GetPooledConnection(connectionString));
+            }
+            catch (AdomdConnectionException)
+            {
+                DropPooledConnection(connectionString);
+                result = run(GetPooledConnection(connectionString));
+            }
+
+            using var resultDoc = JsonDocument.Parse(result);
+            return JsonSerializer.Serialize(new { id, result = resultDoc.RootElement });
+        }
+        catch (Exception ex)
+        {
+            return JsonSerializer.Serialize(new { id, error = ex.Message });
+        }
     }
 
     /// <summary>
@@ -324,6 +324,55 @@ getMetadataCmd.SetHandler((string ws, string ds, string? token) =>
     }
 }, queryWsOpt, queryDsOpt, queryTokenOpt);
 
+// ---------- combined ----------
+var combinedCmd = new Command("combined", "Get DAX documentation and full model metadata over one connection");
+combinedCmd.AddOption(queryWsOpt);
+combinedCmd.AddOption(queryDsOpt);
+combinedCmd.AddOption(queryTokenOpt);
+
+combinedCmd.SetHandler((string ws, string ds, string? token) =>
+{
+    try
+    {
+        var cs = DaxQueryExecutor.BuildConnectionString(ws, ds, token);
+        var result = DaxQueryExecutor.GetDaxDocsAndMetadata(cs);
+        Console.WriteLine(result);
+        Environment.Exit(0);
+    }
+    catch (Exception ex)
+    {
+        Console.Error.WriteLine(ex.Message);
+        Environment.Exit(1);
+    }
+}, queryWsOpt, queryDsOpt, queryTokenOpt);
+
+// ---------- serve ----------
+var serveCmd = new Command("serve", "Answer line-delimited JSON requests on stdin for one semantic model");
+serveCmd.AddOption(queryWsOpt);
+serveCmd.AddOption(queryDsOpt);
+serveCmd.AddOption(queryTokenOpt);
+
+serveCmd.SetHandler((string ws, string ds, string? token) =>
+{
+    try
+    {
+        var cs = DaxQueryExecutor.BuildConnectionString(ws, ds, token);
+        string? line;
+        while ((line = Console.In.ReadLine()) != null)
+        {
+            if (string.IsNullOrWhiteSpace(line)) continue;
+            Console.Out.WriteLine(DaxQueryExecutor.HandleRequest(cs, line));
+            Console.Out.Flush();
+        }
+        Environment.Exit(0);
+    }
+    catch (Exception ex)
+    {
+        Console.Error.WriteLine(ex.Message);
+        Environment.Exit(1);
+    }
+}, queryWsOpt, queryDsOpt, queryTokenOpt);
+
 // wire up
 root.AddCommand(fabricCmd);
 root.AddCommand(exportCmd);
@@ -333,5 +382,7 @@ root.AddCommand(copyCmd);
 root.AddCommand(queryCmd);
 root.AddCommand(getDaxDocsCmd);
 root.AddCommand(getMetadataCmd);
+root.AddCommand(combinedCmd);
+root.AddCommand(serveCmd);
 
 return await root.InvokeAsync(args);